@@ -1,10 +1,12 @@
 from main.code.engine.constants import AUDIO_END, LEVEL_RESET, LEVEL_LOAD
 from time import time
-from typing import Callable
+from typing import Callable, Optional
 
-from pygame import KEYDOWN, QUIT
+from pygame import KEYDOWN, QUIT, Rect
+from pygame import draw as pydraw
 from pygame.event import Event
 from pygame.event import get as get_events
+from pygame.surface import Surface
 from pygame.time import Clock
 
 from main.code.constants import FPS, PROCESS
@@ -29,6 +31,14 @@ class Application(Engine):
 
         self.clock = Clock()
 
+        # Fraction of each frame spent on loading levels
+        self.load_budget = 0.5 / fps
+
+        # Last frame of the old level, faded out after a level swap
+        self.fade: Optional[Surface] = None
+        self.fade_alpha = 0.0
+        self.fade_time = 0.25  # seconds
+
         if self.debug:
             # Debug timing
             self.debug.time_record = {
@@ -44,11 +54,25 @@ class Application(Engine):
             # Event handler
             self.event_handler()
 
-            # Updating
-            self.update()
+            # Start at most one level transition between frames
+            self.transitions.run()
+
+            # Continue loading level, fading in once it is swapped in
+            level = self.objects.level
+            if level.loading is not None and level.step(self.load_budget):
+                self.begin_fade()
 
-            # Drawing
-            self.draw_all()
+            if level.loading is not None:
+                # Old level stays on screen, frozen, while loading
+                self.draw_all()
+                self.draw_loading()
+            else:
+                # Updating
+                self.update()
+
+                # Drawing
+                self.draw_all()
+            self.draw_fade()
 
             # Rendering
             self.render()
@@ -67,7 +91,7 @@ class Application(Engine):
 
         for event in events:
             if event.type == LEVEL_RESET:
-                self.objects.level.reset()
+                self.transitions.reset()
 
             elif event.type == QUIT:
                 self.end()
@@ -77,7 +101,7 @@ class Application(Engine):
                 self.output.audio.music.end()
 
             elif event.type == LEVEL_LOAD:
-                self.objects.level.load(event.level)
+                self.transitions.load(event.level)
 
             else:
                 if event.type == KEYDOWN:
@@ -100,6 +124,32 @@ class Application(Engine):
         if self.debug:
             self.debug.time_record["Draw"] += time() - t
 
+    def draw_loading(self):
+        """Draw a progress bar while a level is loading."""
+        width, height = self.cam.size.x // 2, 8
+        surface = Surface((width, height))
+        surface.fill((255, 255, 255))
+        pydraw.rect(surface, (16, 16, 16), Rect(0, 0, width, height), 1)
+        progress = Rect(0, 0, width * self.objects.level.progress, height)
+        pydraw.rect(surface, (16, 16, 16), progress)
+        pos = vec2d((self.cam.size.x - width) / 2, self.cam.size.y / 2)
+        self.output.draw.add(0, surface, pos, gui=True)
+
+    def begin_fade(self):
+        """Cross-fade from the last frame drawn to the current level."""
+        self.fade = self.cam.surface.copy()
+        self.fade_alpha = 255.0
+
+    def draw_fade(self):
+        if self.fade is None:
+            return
+        self.fade_alpha -= 255 / (self.fade_time * self.FPS)
+        if self.fade_alpha <= 0:
+            self.fade = None
+            return
+        self.fade.set_alpha(int(self.fade_alpha))
+        self.output.draw.add(15, self.fade, vec2d(0, 0), gui=True)
+
     def update(self):
         """Update all objects and debug."""
         # Setup
@@ -111,6 +161,7 @@ class Application(Engine):
             t = time()
 
         obj.update()
+        self.objects.stream.update()
 
         if debug:
             # Update debug menu
@@ -4,3 +4,6 @@ from main.code.engine.components.object_handler import ObjectHandler
 from main.code.engine.components.output_handler import Audio, Draw, Window
 from main.code.engine.components.debug import Debug
 from main.code.engine.components.settings import Settings
+from main.code.engine.components.transition_handler import (
+    TransitionHandler,
+)
@@ -1,4 +1,5 @@
 from os import path, listdir
+from typing import Optional
 import re
 
 from pygame.surface import Surface
@@ -6,7 +7,28 @@ from pygame.image import load
 from pygame import font, Rect
 
 from main.code.engine.types import Component
-from main.code.engine.constants import colorize
+from main.code.engine.constants import colorize, cprint
+
+
+class Manifest:
+    """Every asset a level uses.
+    tilemaps: tilemap ids.
+    sprites: (file name, alpha) pairs as cached by Sprites.
+    sfx, music: file names."""
+
+    def __init__(self):
+        self.tilemaps: set[int] = set()
+        self.sprites: set[tuple[str, bool]] = set()
+        self.sfx: set[str] = set()
+        self.music: set[str] = set()
+
+    def __len__(self):
+        return (
+            len(self.tilemaps)
+            + len(self.sprites)
+            + len(self.sfx)
+            + len(self.music)
+        )
 
 
 class AssetHandler(Component):
@@ -17,6 +39,30 @@ class AssetHandler(Component):
         self.tiles = Tiles(engine)
         self.font = Font(engine)
 
+    def load(self, manifest: Manifest, tilemaps: dict[str, Surface] = None):
+        """Load the assets of a manifest up front, keeping those already
+        loaded. tilemaps are images already read by Tiles.read_tilemaps.
+        Music is streamed when played so it is only checked for."""
+        for fname, image in (tilemaps or {}).items():
+            self.tiles.add_tilemap(fname, image)
+        self.tiles.load(manifest.tilemaps)
+
+        for name, alpha in manifest.sprites:
+            self.sprites.get(alpha, name)
+
+        sfx = self.engine.output.audio.sfx
+        for name in manifest.sfx:
+            sfx.add(name)
+
+        for name in manifest.music:
+            if not path.exists(path.join(self.paths["music"], name)):
+                cprint(f"music not found: {name}", "yellow")
+
+    def keep(self, manifest: Manifest):
+        """Drop the tilemaps and sprites a manifest does not list."""
+        self.tiles.keep(manifest.tilemaps)
+        self.sprites.keep(manifest.sprites)
+
     def clear(self):
         # self.audio.clear()
         self.tiles.clear()
@@ -32,27 +78,61 @@ class AssetHandler(Component):
 
 
 class Sprites(Component):
+    """Loads sprites once and shares them between objects."""
+
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.sprites: dict[tuple[str, bool], Surface] = {}
+
     def get(self, alpha: bool, *fname: str) -> list[Surface]:
         sprites: list[Surface] = []
         for name in fname:
-            sprites.append(load(path.join(self.paths["sprites"], name)))
-        if alpha:
-            sprites = [sprite.convert_alpha() for sprite in sprites]
-        else:
-            sprites = [sprite.convert() for sprite in sprites]
+            try:
+                sprite = self.sprites[(name, alpha)]
+            except KeyError:
+                sprite = load(path.join(self.paths["sprites"], name))
+                if alpha:
+                    sprite = sprite.convert_alpha()
+                else:
+                    sprite = sprite.convert()
+                self.sprites[(name, alpha)] = sprite
+            sprites.append(sprite)
         return sprites
 
+    def keep(self, sprites: set[tuple[str, bool]]):
+        """Drop every cached sprite not in sprites."""
+        for sprite in set(self.sprites) - sprites:
+            del self.sprites[sprite]
+
+    def clear(self):
+        self.sprites.clear()
+
 
 class Tiles(Component):
     def __init__(self, engine):
         super().__init__(engine)
         self.tilemaps: dict[int, list[Surface]] = {}
+        self._files: Optional[dict[int, str]] = None
         self.add_tilemap("0-null.png")
 
-    def add_tilemap(self, fname: str):
-        """Adds a new tilemap to the tile_maps dictionary."""
+    @property
+    def files(self) -> dict[int, str]:
+        """Tilemap id to file name, listed once from the tilemaps dir."""
+        if self._files is None:
+            self._files = {}
+            for file in listdir(self.paths["tilemaps"]):
+                number = re.match(r"[0-9]+-", file)
+                if number is not None:
+                    self._files[int(number[0][:-1])] = file
+        return self._files
+
+    def add_tilemap(self, fname: str, image: Surface = None):
+        """Adds a new tilemap to the tile_maps dictionary.
+        image can be given if the file was already read, see read_tilemaps."""
         # Get image
-        tile_set = load(path.join(self.paths["tilemaps"], fname)).convert()
+        if image is None:
+            image = load(path.join(self.paths["tilemaps"], fname))
+        tile_set = image.convert()
         new_tile_map = []
 
         # Iterate through each tile in image
@@ -78,13 +158,39 @@ class Tiles(Component):
 
     def add_all(self):
         """Load all of the tilemaps."""
-        # Get all tile maps
-        directory = listdir(self.paths["tilemaps"])
-        for file in directory:
-            if re.match(r"[0-9]+", file) is not None:
-                self.add_tilemap(file)
+        self.load(set(self.files))
+
+    def load(self, ids: set[int]):
+        """Load every tilemap in ids which is not loaded yet."""
+        for tilemap_id in ids:
+            if tilemap_id not in self.tilemaps and tilemap_id in self.files:
+                self.add_tilemap(self.files[tilemap_id])
+
+    def keep(self, ids: set[int]):
+        """Drop every tilemap not in ids, apart from the null tilemap."""
+        for tilemap_id in set(self.tilemaps) - ids - {0}:
+            del self.tilemaps[tilemap_id]
+
+    def read_tilemaps(
+        self, files: dict[int, str], ids: set[int]
+    ) -> dict[str, Surface]:
+        """Read the images of tilemaps without adding them.
+        files is a copy of self.files taken on the main thread, so this
+        touches no shared state and can run on a worker thread."""
+        images: dict[str, Surface] = {}
+        for tilemap_id, file in files.items():
+            if tilemap_id in ids:
+                images[file] = load(path.join(self.paths["tilemaps"], file))
+        return images
 
     def get(self, tile_info: tuple) -> Surface:
+        if tile_info[0] not in self.tilemaps:
+            # Find tile map, listing the directory again if it is new
+            if tile_info[0] not in self.files:
+                self._files = None
+            if tile_info[0] in self.files:
+                self.add_tilemap(self.files[tile_info[0]])
+
         if tile_info[0] in self.tilemaps:
             # Return tile
             tilemap = self.tilemaps[tile_info[0]]
@@ -99,12 +205,6 @@ class Tiles(Component):
                 )
                 raise IndexError(colorize(msg, "red"))
 
-        else:
-            # Try to find tile map and return tile
-            for file in listdir(self.paths["tilemaps"]):
-                if re.match(f"{tile_info[0]}-", file) is not None:
-                    self.add_tilemap(file)
-                    return self.tilemaps[tile_info[0]][tile_info[1]]
         msg = (
             "Tilemap not found.\n"
             f"Tilemap dir: {self.paths['tilemaps']}\n"
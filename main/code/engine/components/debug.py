@@ -1,7 +1,11 @@
 """Debug object for containing and displaying debug info."""
 
+from __future__ import annotations
+from contextlib import contextmanager
 from os import path, mkdir
 from datetime import datetime
+from time import perf_counter
+from typing import Iterator, Optional
 
 from main.code.engine.components.menu import Menu, MenuRect, MenuText
 from main.code.engine.components.output_handler import Draw
@@ -37,8 +41,14 @@ class Debug(Component, Entity):
             memory.font = "consolas"
             memory.depth = 16
 
+            load = MenuText(engine, self.menu, "load")
+            load.size = 12
+            load.pos = vec2d(0, 36)
+            load.font = "consolas"
+            load.depth = 16
+
             rect = MenuRect(engine, self.menu, "rect")
-            rect.size = vec2d(160, 36)
+            rect.size = vec2d(160, 48)
             rect.color = (0, 0, 0)
 
             # Create debug directory
@@ -58,6 +68,9 @@ class Debug(Component, Entity):
             self.time_record = {}
             self.clock = 0
 
+        # Last level load
+        self.load_profile: Optional[LoadProfile] = None
+
     def __bool__(self):
         return self.debug
 
@@ -93,3 +106,72 @@ class Debug(Component, Entity):
         file = open(self.file, "a")
         file.write(write + "\n")
         file.close()
+
+    def record_load(self, profile: LoadProfile):
+        """Keep and show a level load profile and write it to file."""
+        self.load_profile = profile
+        if self.debug:
+            self.menu.get("load").text = profile.summary()
+            file = open(self.file, "a")
+            file.write("\n".join(profile.lines()) + "\n\n")
+            file.close()
+
+
+class LoadProfile:
+    """Time spent in each phase of a level load and counts of what it
+    made, phases and counts are kept in the order first recorded."""
+
+    def __init__(self, level: str):
+        self.level = level
+        self.phases: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.objects: dict[str, int] = {}
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def count(self, name: str, amount: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    @contextmanager
+    def phase(self, phase: str):
+        """Time the body of a with statement."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, perf_counter() - start)
+
+    def timed(self, phase: str, steps: Iterator) -> Iterator:
+        """Yield from steps, timing only the time spent inside them so
+        frames between steps are not counted."""
+        steps = iter(steps)
+        while True:
+            start = perf_counter()
+            try:
+                value = next(steps)
+            except StopIteration:
+                self.add(phase, perf_counter() - start)
+                return
+            self.add(phase, perf_counter() - start)
+            yield value
+
+    def summary(self) -> str:
+        name = path.basename(self.level)
+        return f"load: {self.total * 1000:.1f} ms ({name})"
+
+    def lines(self) -> list[str]:
+        size = max((len(name) for name in self.phases), default=0)
+        lines = [f"### Level load: {self.level}"]
+        lines.append(f"Total: {self.total * 1000:.2f} ms")
+        for phase, seconds in self.phases.items():
+            lines.append(f"{phase:<{size}}: {seconds * 1000:.2f} ms")
+        for name, amount in self.counts.items():
+            lines.append(f"{name}: {amount}")
+        for name, amount in sorted(self.objects.items()):
+            lines.append(f"objects {name}: {amount}")
+        return lines
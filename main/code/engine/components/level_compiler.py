@@ -0,0 +1,181 @@
+"""Offline level compiler.
+
+Checks a JSON level against the tilemaps and the other levels, then
+writes a compiled .gxl holding the packed grids and entity table along
+with one pre-rasterised PNG per tile layer. Compiled levels live in
+assets/levels/compiled and are loaded instead of the JSON level while
+they are newer, see level_format.newest_level.
+
+Everything here runs without a display so levels can be compiled in
+worker processes."""
+
+from __future__ import annotations
+from os import listdir, makedirs, path, remove, replace
+import re
+
+from numpy import (
+    concatenate,
+    int64,
+    ndarray,
+    searchsorted,
+    uint8,
+    unique,
+    zeros,
+)
+from pygame import image, surfarray, SRCALPHA
+from pygame.surface import Surface
+
+from main.code.engine.components import level_format
+from main.code.engine.types import tile_array2d
+
+
+def tilemap_files(directory: str) -> dict[int, str]:
+    """Tilemap id to file name for every tilemap in directory."""
+    files: dict[int, str] = {}
+    for file in listdir(directory):
+        number = re.match(r"[0-9]+-", file)
+        if number is not None:
+            files[int(number[0][:-1])] = file
+    return files
+
+
+def compiled_path(levels: str, name: str) -> str:
+    return path.join(levels, level_format.COMPILED, name + ".gxl")
+
+
+def compile_level(
+    levels: str, tilemaps: str, name: str, halftile: int
+) -> tuple[str, list[str], list[str]]:
+    """Validate and compile one level.
+    Returns (name, errors, written files). Nothing is written when there
+    are errors."""
+    level = level_format.read_json(path.join(levels, name + ".json"))
+    level_names = {
+        path.splitext(file)[0]
+        for file in listdir(levels)
+        if file.endswith(".json")
+    }
+    used = level.tilemap_ids()
+    tilesets = {
+        tilemap_id: _read_tileset(path.join(tilemaps, file), halftile)
+        for tilemap_id, file in tilemap_files(tilemaps).items()
+        if tilemap_id in used
+    }
+
+    errors = validate_tiles(level, tilesets)
+    errors += validate_objects(level, level_names)
+    if errors:
+        return (name, errors, [])
+
+    # Write to temporary files which are only moved into place once all
+    # of them are written, so a failure leaves no partial level behind
+    directory = path.join(levels, level_format.COMPILED)
+    makedirs(directory, exist_ok=True)
+    moves: list[tuple[str, str]] = []
+    level.images = []
+    try:
+        # Pre-rasterise layers
+        for i, (_, _, codes) in enumerate(level.layers):
+            fname = f"{name}.{i}.png"
+            temp = path.join(directory, f"{name}.{i}.tmp.png")
+            moves.append((temp, path.join(directory, fname)))
+            surface = rasterise(codes, tilesets, halftile)
+            image.save(surface, temp)
+            level.images.append(fname)
+
+        # Written last so it is never newer than its images
+        fname = compiled_path(levels, name)
+        moves.append((fname + ".tmp", fname))
+        level_format.write_binary(fname + ".tmp", level)
+    except Exception:
+        for temp, _ in moves:
+            if path.exists(temp):
+                remove(temp)
+        raise
+
+    for temp, fname in moves:
+        replace(temp, fname)
+    return (name, errors, [fname for _, fname in moves])
+
+
+# Validation
+def validate_tiles(
+    level: level_format.LevelData, tilesets: dict[int, ndarray]
+) -> list[str]:
+    """Every tile must come from an existing tilemap and lie inside it."""
+    errors = []
+    for layer_name, _, codes in level.layers:
+        for code in unique(codes[codes != 0]).tolist():
+            tilemap_id, tile_id = tile_array2d.decode(code)
+            if tilemap_id not in tilesets:
+                errors.append(
+                    f"layer {layer_name}: tilemap {tilemap_id} not found"
+                )
+                continue
+            count = len(tilesets[tilemap_id])
+            if not -count <= tile_id < count:
+                errors.append(
+                    f"layer {layer_name}: tile {tile_id} outside of "
+                    f"tilemap {tilemap_id} with {count} tiles"
+                )
+    return errors
+
+
+def validate_objects(
+    level: level_format.LevelData, level_names: set[str]
+) -> list[str]:
+    """Doors must lead to existing levels and buttons to existing doors."""
+    errors = []
+    doors = {key for name, _, key, _ in level.objects if name == "door"}
+    for name, pos, key, data in level.objects:
+        if name == "door":
+            target = data.get("level")
+            if target is not None and target not in level_names:
+                errors.append(f"door {key} at {pos}: no level {target}")
+        elif name == "button":
+            door = data.get("door")
+            if door is not None and door not in doors:
+                errors.append(f"button {key} at {pos}: no door {door}")
+    return errors
+
+
+# Rasterising
+def rasterise(
+    codes: ndarray, tilesets: dict[int, ndarray], halftile: int
+) -> Surface:
+    """Render a layer of tile codes to a surface in one pass.
+    Tilesets are stacks of RGBA tiles from _read_tileset."""
+    width, height = codes.shape
+
+    # Stack every used tile after a transparent one for empty cells
+    used = unique(codes)
+    used = used[used != 0]
+    tiles = [zeros((1, halftile, halftile, 4), dtype=uint8)]
+    for code in used.tolist():
+        tilemap_id, tile_id = tile_array2d.decode(code)
+        tiles.append(tilesets[tilemap_id][tile_id][None])
+    stack = concatenate(tiles)
+
+    # Look up each cell and lay the tiles out as [x, y] pixels
+    lookup = concatenate(([0], used)).astype(int64)
+    cells = stack[searchsorted(lookup, codes)]
+    pixels = cells.transpose(0, 2, 1, 3, 4).reshape(
+        (width * halftile, height * halftile, 4)
+    )
+
+    surface = Surface(pixels.shape[:2], SRCALPHA)
+    surfarray.pixels3d(surface)[:] = pixels[:, :, :3]
+    surfarray.pixels_alpha(surface)[:] = pixels[:, :, 3]
+    return surface
+
+
+def _read_tileset(fname: str, halftile: int) -> ndarray:
+    """Tiles of a tilemap image as an array of opaque RGBA tiles indexed
+    [tile, x, y, channel], matching the tiles made by Tiles.add_tilemap."""
+    tileset = image.load(fname)
+    count = round(tileset.get_width() / halftile)
+    pixels = zeros((count * halftile, halftile, 4), dtype=uint8)
+    rgb = surfarray.array3d(tileset)[: count * halftile, :halftile]
+    pixels[: rgb.shape[0], : rgb.shape[1], :3] = rgb
+    pixels[:, :, 3] = 255
+    return pixels.reshape((count, halftile, halftile, 4))
@@ -0,0 +1,365 @@
+"""Reading and writing levels as JSON or as binary .gxl files.
+
+Binary layout, all little endian and every block aligned to 4 bytes:
+    header  b"GXL" + version byte, uint32 block count
+    block   4 byte tag, uint32 payload length, payload, padding
+
+Blocks:
+    TILE  uint32 name length, name, uint32 data length, data as JSON,
+          uint32 width, uint32 height, padding to 4 bytes,
+          width * height uint32 tile_array2d codes indexed as [x, y]
+    COLL  uint32 width, uint32 height, width * height bits indexed [x, y]
+    ENTS  JSON list of [name, [x, y], key, data]
+    IMGS  optional JSON list of pre-rendered layer image file names,
+          relative to the .gxl file, one per TILE block in order
+
+Binary files are memory mapped and tile codes are handed over as views
+of the map, so loading does no per cell Python work.
+
+In JSON files a tile-layer or static-collider grid is either a list of
+columns or, when that is smaller, a run length encoded dict:
+    {"size": [width, height], "palette": [cell, ...],
+     "runs": [palette index, count, palette index, count, ...]}
+with runs covering the cells column by column."""
+
+from __future__ import annotations
+from mmap import mmap, ACCESS_COPY
+from os import path, remove, replace
+from struct import Struct
+from typing import Iterable
+import json
+
+from numpy import (
+    asarray,
+    concatenate,
+    diff,
+    flatnonzero,
+    frombuffer,
+    int64,
+    ndarray,
+    packbits,
+    repeat,
+    stack,
+    uint8,
+    uint32,
+    unique,
+    unpackbits,
+    zeros,
+)
+
+from main.code.engine.types import tile_array2d
+from main.code.engine.constants import colorize
+
+MAGIC = b"GXL"
+VERSION = 1
+COMPILED = "compiled"  # Directory of compiled levels
+
+HEADER = Struct("<3sBI")
+BLOCK = Struct("<4sI")
+UINT = Struct("<I")
+SIZE = Struct("<II")
+
+
+class LevelData:
+    """Parsed level which can be built by the LevelHandler.
+    layers: list of (name, data, uint32 code array).
+    collider: bool array indexed as [x, y].
+    objects: list of (name, (x, y), key, data).
+    images: paths of pre-rendered layer images, empty if there are none."""
+
+    def __init__(self):
+        self.layers: list[tuple[str, dict, ndarray]] = []
+        self.collider: ndarray = zeros((1, 1), dtype=bool)
+        self.objects: list[tuple[str, tuple[int, int], int, dict]] = []
+        self.images: list[str] = []
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the grids."""
+        layers = sum(codes.nbytes for _, _, codes in self.layers)
+        return layers + self.collider.nbytes
+
+    def objects_only(self) -> "LevelData":
+        """Level with the same objects and no grids."""
+        level = LevelData()
+        level.objects = self.objects
+        return level
+
+    def tilemap_ids(self) -> set[int]:
+        """Ids of every tilemap used by the tile layers."""
+        ids: set[int] = set()
+        for _, _, codes in self.layers:
+            used = unique(codes[codes != 0]) - 1
+            ids.update((used >> tile_array2d.TILE_BITS).tolist())
+        return ids
+
+
+# JSON
+def from_json(level_data: list[list]) -> LevelData:
+    """Parse the list stored in a JSON level file."""
+    level = LevelData()
+    for obj in level_data:
+        name = obj[0]
+
+        # Tile layer
+        if name == "tile-layer":
+            layer_name, array, data = obj[1:4]
+            codes = tiles_from_json(array)
+            level.layers.append((layer_name, dict(data), codes))
+
+        # Static collider
+        elif name == "static-collider":
+            level.collider = collider_from_json(obj[1])
+
+        # Any game object
+        else:
+            pos, key, data = obj[1:4]
+            level.objects.append((name, tuple(pos), int(key), dict(data)))
+    return level
+
+
+def to_json(level: LevelData) -> list[list]:
+    """Inverse of from_json."""
+    level_data = []
+    for name, data, codes in level.layers:
+        level_data.append(["tile-layer", name, tiles_to_json(codes), data])
+    level_data.append(["static-collider", collider_to_json(level.collider)])
+    for name, pos, key, data in level.objects:
+        level_data.append([name, list(pos), key, data])
+    return level_data
+
+
+def tiles_from_json(grid) -> ndarray:
+    """tile_array2d codes from a list of columns or an encoded dict."""
+    if isinstance(grid, dict):
+        palette = [tile_array2d.encode(cell) for cell in grid["palette"]]
+        return _decode_runs(grid, asarray(palette, dtype=uint32))
+    return tile_array2d.encode_columns(grid)
+
+
+def tiles_to_json(codes: ndarray):
+    """List of columns or encoded dict, whichever is smaller."""
+    palette, runs = _encode_runs(codes)
+    palette = [tile_array2d.decode(code) for code in palette.tolist()]
+    columns = tile_array2d.decode_columns(codes)
+    return _smallest(columns, codes.shape, palette, runs)
+
+
+def collider_from_json(grid) -> ndarray:
+    """bool array from a list of columns or an encoded dict."""
+    if isinstance(grid, dict):
+        return _decode_runs(grid, asarray(grid["palette"], dtype=bool))
+    return asarray(grid, dtype=bool)
+
+
+def collider_to_json(array: ndarray):
+    """List of columns of 1 and 0 or encoded dict, whichever is smaller."""
+    array = array.astype(uint8)
+    palette, runs = _encode_runs(array)
+    return _smallest(array.tolist(), array.shape, palette.tolist(), runs)
+
+
+def read_json(fname: str) -> LevelData:
+    with open(fname, "r") as file:
+        return from_json(json.loads(file.read()))
+
+
+def write_json(fname: str, level: LevelData):
+    write_entries(fname, to_json(level))
+
+
+def write_entries(fname: str, entries: Iterable[list]):
+    """Write level entries one per line, streamed to a temporary file
+    which then replaces fname so a failed save never leaves half a level.
+    Entries are only serialised as they are written, so entries can be
+    a generator which builds each one on demand."""
+    temp = fname + ".tmp"
+    try:
+        with open(temp, "w") as file:
+            file.write("[")
+            for i, entry in enumerate(entries):
+                file.write(",\n    " if i else "\n    ")
+                file.write(json.dumps(entry))
+            file.write("\n]")
+        replace(temp, fname)
+    except BaseException:
+        if path.exists(temp):
+            remove(temp)
+        raise
+
+
+# Binary
+def read_binary(fname: str) -> LevelData:
+    """Memory map a .gxl file. Copy on write so arrays are writable."""
+    with open(fname, "rb") as file:
+        buffer = mmap(file.fileno(), 0, access=ACCESS_COPY)
+
+    magic, version, count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+        msg = (
+            "LEVEL ERROR\n"
+            f"path: {fname}\n"
+            f"header: {magic}, version {version}\n"
+            "not a supported .gxl file\n"
+        )
+        raise ValueError(colorize(msg, "red"))
+
+    level = LevelData()
+    offset = HEADER.size
+    for _ in range(count):
+        tag, length = BLOCK.unpack_from(buffer, offset)
+        offset += BLOCK.size
+        end = offset + length
+        if tag == b"TILE":
+            level.layers.append(_read_tiles(buffer, offset))
+        elif tag == b"COLL":
+            width, height = SIZE.unpack_from(buffer, offset)
+            start = offset + SIZE.size
+            bits = frombuffer(buffer, uint8, length - SIZE.size, start)
+            bits = unpackbits(bits, count=width * height)
+            level.collider = bits.reshape((width, height)).view(bool)
+        elif tag == b"ENTS":
+            objects = json.loads(bytes(buffer[offset:end]))
+            for name, pos, key, data in objects:
+                level.objects.append((name, tuple(pos), key, data))
+        elif tag == b"IMGS":
+            directory = path.dirname(fname)
+            images = json.loads(bytes(buffer[offset:end]))
+            level.images = [path.join(directory, name) for name in images]
+        offset = _align(end)
+    return level
+
+
+def write_binary(fname: str, level: LevelData):
+    blocks: list[tuple[bytes, bytes]] = []
+
+    # Tile layers
+    for name, data, codes in level.layers:
+        name_bytes = name.encode()
+        data_bytes = json.dumps(data).encode()
+        head = b"".join(
+            (
+                UINT.pack(len(name_bytes)),
+                name_bytes,
+                UINT.pack(len(data_bytes)),
+                data_bytes,
+                SIZE.pack(*codes.shape),
+            )
+        )
+        head += bytes(_align(len(head)) - len(head))
+        body = codes.astype("<u4", copy=False).tobytes()
+        blocks.append((b"TILE", head + body))
+
+    # Static collider, one bit per cell
+    size = SIZE.pack(*level.collider.shape)
+    bits = packbits(level.collider, axis=None).tobytes()
+    blocks.append((b"COLL", size + bits))
+
+    # Entities
+    objects = [
+        [name, list(pos), key, data] for name, pos, key, data in level.objects
+    ]
+    blocks.append((b"ENTS", json.dumps(objects).encode()))
+
+    # Pre-rendered layer images
+    if level.images:
+        images = [path.basename(image) for image in level.images]
+        blocks.append((b"IMGS", json.dumps(images).encode()))
+
+    # Write to file
+    with open(fname, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(blocks)))
+        for tag, payload in blocks:
+            file.write(BLOCK.pack(tag, len(payload)))
+            file.write(payload)
+            file.write(bytes(_align(len(payload)) - len(payload)))
+
+
+# Conversion
+def convert(source: str, destination: str):
+    """Convert between .json and .gxl based on the file extensions."""
+    if source.endswith(".gxl"):
+        level = read_binary(source)
+    else:
+        level = read_json(source)
+    if destination.endswith(".gxl"):
+        write_binary(destination, level)
+    else:
+        write_json(destination, level)
+
+
+def newest_level(fname: str) -> str:
+    """Path of the compiled .gxl or else the .gxl next to a .json level
+    when it is up to date, otherwise the .json path."""
+    directory, name = path.split(path.splitext(fname)[0])
+    for binary in (
+        path.join(directory, COMPILED, name + ".gxl"),
+        path.join(directory, name + ".gxl"),
+    ):
+        if path.exists(binary):
+            if not path.exists(fname):
+                return binary
+            if path.getmtime(binary) >= path.getmtime(fname):
+                return binary
+    return fname
+
+
+def read_level(fname: str) -> LevelData:
+    if fname.endswith(".gxl"):
+        return read_binary(fname)
+    return read_json(fname)
+
+
+# Internal
+def _encode_runs(array: ndarray) -> tuple[ndarray, list[int]]:
+    """Palette of values and flat [index, count, ...] runs, column by
+    column."""
+    flat = array.ravel()
+    starts = concatenate(([0], flatnonzero(flat[1:] != flat[:-1]) + 1))
+    counts = diff(concatenate((starts, [len(flat)])))
+    palette, indices = unique(flat[starts], return_inverse=True)
+    runs = stack((indices.ravel(), counts), axis=1).ravel()
+    return palette, runs.tolist()
+
+
+def _decode_runs(grid: dict, palette: ndarray) -> ndarray:
+    """Expand runs straight into an array of palette values."""
+    runs = asarray(grid["runs"], dtype=int64).reshape((-1, 2))
+    width, height = grid["size"]
+    values = repeat(palette[runs[:, 0]], runs[:, 1])
+    if len(values) != width * height:
+        msg = (
+            "LEVEL ERROR\n"
+            f"size: {width}, {height}\n"
+            f"cells in runs: {len(values)}\n"
+            "encoded grid does not match its size\n"
+        )
+        raise ValueError(colorize(msg, "red"))
+    return values.reshape((width, height))
+
+
+def _smallest(columns: list, size: tuple, palette: list, runs: list):
+    encoded = {"size": list(size), "palette": palette, "runs": runs}
+    if len(json.dumps(encoded)) < len(json.dumps(columns)):
+        return encoded
+    return columns
+
+
+def _read_tiles(buffer: mmap, offset: int) -> tuple[str, dict, ndarray]:
+    start = offset
+    (length,) = UINT.unpack_from(buffer, offset)
+    offset += UINT.size
+    name = bytes(buffer[offset : offset + length]).decode()
+    offset += length
+    (length,) = UINT.unpack_from(buffer, offset)
+    offset += UINT.size
+    data = json.loads(bytes(buffer[offset : offset + length]))
+    offset += length
+    width, height = SIZE.unpack_from(buffer, offset)
+    offset = start + _align(offset + SIZE.size - start)
+    codes = frombuffer(buffer, "<u4", width * height, offset)
+    return (name, data, codes.reshape((width, height)))
+
+
+def _align(offset: int) -> int:
+    return (offset + 3) & ~3
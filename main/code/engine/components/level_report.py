@@ -0,0 +1,172 @@
+"""Capacity figures for level files, see main/level_report.py.
+
+Reports are plain dicts so they can be written out as JSON."""
+
+from __future__ import annotations
+from math import ceil
+from os import makedirs, path
+from typing import Callable, Optional
+import json
+
+from main.code.engine.components.debug import LoadProfile
+from main.code.engine.components.object_handler import (
+    LevelHandler,
+    StreamHandler,
+)
+
+BYTES_PER_PIXEL = 4  # Layer surfaces are 32 bpp
+PARSE_PHASES = ("read file", "json.loads", "convert")
+
+
+def report_level(
+    fname: str,
+    fulltile: int,
+    view: tuple[int, int],
+    class_name: Callable[[str], str],
+    model: Optional[LoadModel] = None,
+) -> dict:
+    """Figures for one level file, parsed as LevelHandler parses it.
+    view is the size of the camera, used for streamed levels."""
+    profile = LoadProfile(fname)
+    level = LevelHandler.parse(fname, profile)
+    halftile = fulltile // 2
+
+    # Tile layers
+    layers = []
+    for name, _, codes in level.layers:
+        width, height = codes.shape
+        pixels = width * height * halftile ** 2
+        layers.append(
+            {
+                "name": name,
+                "size": [width, height],
+                "cells": width * height,
+                "tiles": int((codes != 0).sum()),
+                "surface_bytes": pixels * BYTES_PER_PIXEL,
+            }
+        )
+    largest = max((layer["cells"] for layer in layers), default=0)
+    streamed = largest > LevelHandler.STREAM_CELLS
+    if streamed:
+        for layer in layers:
+            layer["surface_bytes"] = _streamed_bytes(
+                layer["size"], halftile, view
+            )
+
+    # Objects by class
+    objects: dict[str, int] = {}
+    for name, _, _, _ in level.objects:
+        cname = class_name(name)
+        objects[cname] = objects.get(cname, 0) + 1
+
+    width, height = level.collider.shape
+    report = {
+        "level": path.splitext(path.basename(fname))[0],
+        "file": fname,
+        "bytes": path.getsize(fname),
+        "size": [width, height],
+        "pixels": [width * fulltile, height * fulltile],
+        "layers": layers,
+        "cells": sum(layer["cells"] for layer in layers) + width * height,
+        "tiles": sum(layer["tiles"] for layer in layers),
+        "objects": dict(sorted(objects.items())),
+        "object_count": len(level.objects),
+        "surface_bytes": sum(layer["surface_bytes"] for layer in layers),
+        "grid_bytes": level.nbytes,
+        "streamed": streamed,
+        "parse_ms": sum(profile.phases.values()) * 1000,
+    }
+    if model is not None:
+        report["load_ms"] = model.predict(report) * 1000
+    return report
+
+
+class LoadModel:
+    """Predicts how long a level takes to load from what it contains.
+    Each part of a load costs a time per unit of what drives it:
+        base    per load, for assets, walls and the swap
+        cell    per grid cell parsed
+        pixel   per pixel of layer surface rendered
+        object  per object created
+    Coefficients are seconds, fitted to real loads by fit."""
+
+    # Measured on a development machine, see main/level_report.py
+    DEFAULTS = {
+        "base": 5.0e-4,
+        "cell": 7.0e-8,
+        "pixel": 6.0e-9,
+        "object": 5.0e-5,
+    }
+
+    def __init__(self, coefficients: Optional[dict[str, float]] = None):
+        self.coefficients = dict(self.DEFAULTS)
+        if coefficients is not None:
+            self.coefficients.update(coefficients)
+
+    def predict(self, report: dict) -> float:
+        """Seconds to load the level of a report."""
+        c = self.coefficients
+        seconds = c["base"] + c["cell"] * report["cells"]
+        if not report["streamed"]:
+            pixels = report["surface_bytes"] / BYTES_PER_PIXEL
+            seconds += c["pixel"] * pixels
+            seconds += c["object"] * report["object_count"]
+        return seconds
+
+    @classmethod
+    def fit(cls, samples: list[tuple[dict, LoadProfile]]) -> LoadModel:
+        """Fit coefficients to reports of levels and profiles of loading
+        them, each the total time of a part over the total of its unit."""
+        totals = {name: 0.0 for name in cls.DEFAULTS}
+        units = {name: 0.0 for name in cls.DEFAULTS}
+        for report, profile in samples:
+            phases = dict(profile.phases)
+            parse = sum(phases.pop(phase, 0.0) for phase in PARSE_PHASES)
+            layers = phases.pop("tile layers", 0.0)
+            objects = phases.pop("objects", 0.0) + phases.pop("create", 0.0)
+            pixels = report["surface_bytes"] / BYTES_PER_PIXEL
+            count = report["object_count"]
+            if report["streamed"]:
+                # Layers and objects are made as the camera moves
+                pixels, count = 0, 0
+            parts = (
+                ("base", sum(phases.values()), 1),
+                ("cell", parse, report["cells"]),
+                ("pixel", layers, pixels),
+                ("object", objects, count),
+            )
+            for name, seconds, amount in parts:
+                totals[name] += seconds
+                units[name] += amount
+        return cls(
+            {
+                name: totals[name] / units[name]
+                for name in totals
+                if units[name] > 0
+            }
+        )
+
+    @classmethod
+    def read(cls, fname: str) -> LoadModel:
+        """Model saved by write, or the defaults if there is none."""
+        if not path.exists(fname):
+            return cls()
+        with open(fname, "r") as file:
+            return cls(json.load(file))
+
+    def write(self, fname: str):
+        makedirs(path.dirname(fname), exist_ok=True)
+        with open(fname, "w") as file:
+            json.dump(self.coefficients, file, indent=4)
+
+
+def _streamed_bytes(
+    size: list[int], halftile: int, view: tuple[int, int]
+) -> int:
+    """Most bytes of chunk surfaces a streamed layer keeps loaded."""
+    tiles = StreamHandler.CHUNK
+    chunk = tiles * halftile
+    margin = 2 * StreamHandler.UNLOAD_MARGIN + 1
+    across = min(ceil(view[0] / chunk) + margin, ceil(size[0] / tiles))
+    down = min(ceil(view[1] / chunk) + margin, ceil(size[1] / tiles))
+    return across * down * chunk ** 2 * BYTES_PER_PIXEL
@@ -20,3 +20,9 @@ def f_limit(value, minval, maxval):
     if value > maxval:
         return maxval
     return value
+
+
+# Return the grid cell containing a position
+def f_cell(pos, cell_size: int) -> tuple[int, int]:
+    """Returns the (x, y) cell of size cell_size containing pos."""
+    return (int(pos.x // cell_size), int(pos.y // cell_size))
@@ -4,12 +4,11 @@ from __future__ import annotations
 from typing import Any, Callable
 
 
-from pygame import Rect
 from pygame.surface import Surface
 
 
 from main.code.engine.constants import colorize
-from main.code.engine.types import vec2d, Component
+from main.code.engine.types import AABB, vec2d, Component
 from main.code.engine.components.output_handler import Draw
 
 
@@ -332,10 +331,9 @@ class MenuButton(MenuElement):
                     self._focus = False
 
     def collide(self, pos) -> bool:
-        pos -= self.get_cpos(self.size)
-        if Rect((0, 0), self.size.tup()).collidepoint(pos):
-            return True
-        return False
+        cpos = self.get_cpos(self.size)
+        box = AABB(cpos.x, cpos.y, self.size.x, self.size.y)
+        return box.contains_point(pos.x, pos.y)
 
     def pressed(self, button: MenuButton, pos: vec2d) -> None:
         pass
@@ -1,53 +1,136 @@
-from typing import Any, Callable
-from os import path
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, Union
+from os import path, stat
+import json
 
+from numpy import ndarray, nonzero
 from pygame.surface import Surface
-from pygame import draw as pydraw, Rect
-import json
-import uuid
+from pygame import draw as pydraw, image, Rect
 
+from main.code.engine.components import level_format
+from main.code.engine.components.asset_handler import Manifest
+from main.code.engine.components.debug import LoadProfile
+from main.code.engine.components.maths import f_cell
 from main.code.engine.components.output_handler import Draw
-from main.code.engine.types import Component, array2d, vec2d
+from main.code.engine.types import (
+    Component,
+    bool_array2d,
+    tile_array2d,
+    vec2d,
+)
 from main.code.engine.types.entity import Entity
 from main.code.engine.constants import colorize, cprint
 
 
 class ObjectHandler(Component):
-    def __init__(self, engine, create_object: Callable):
+    def __init__(
+        self,
+        engine,
+        create_object: Callable,
+        level: Optional["LevelHandler"] = None,
+    ):
         super().__init__(engine)
-        self.level = LevelHandler(engine)
+        self.level = LevelHandler(engine) if level is None else level
         self.ent = EntityHandler(engine)
         self.tile = TileHandler(engine)
         self.col = CollisionHandler(engine)
+        self.stream = StreamHandler(engine)
         self.create_object = create_object
 
     # Base methods
     def update(self):
         self.ent.update()
+        self.stream.update()
 
     def draw(self, draw: Draw):
         self.ent.draw(draw)
         self.tile.draw(draw)
 
     def clear(self):
+        self.stream.clear()
         self.ent.clear()
         self.tile.clear()
 
 
 # Level
 class LevelHandler(Component):
-    """Object which loads and saves levels."""
+    """Object which loads and saves levels.
+    Parsed levels are kept in a least recently used cache so revisits
+    skip reading and parsing the file. Streamed levels are not cached as
+    their grids are as big as the world, and only the objects of the
+    live level are kept for resets."""
+
+    CACHE_LIMIT = 32 * 2 ** 20  # bytes
+    STREAM_CELLS = 2 ** 20  # tiles in a layer before a level is streamed
 
     def __init__(self, engine):
         super().__init__(engine)
         self.current_level = ""
         self.size = vec2d(0, 0)
+        self.cache: OrderedDict[str, tuple[int, level_format.LevelData]]
+        self.cache = OrderedDict()
+        self.cache_limit = self.CACHE_LIMIT
+        self.current_file = ""
+        self.snapshot: Optional[level_format.LevelData] = None
+        self.snapshot_mtime = 0
+
+        # Levels with a layer of more tiles are streamed, None to never
+        self.stream_cells: Optional[int] = self.STREAM_CELLS
+
+        # Maps object names to classes for asset manifests
+        self.object_class: Optional[Callable[[str], Optional[type]]] = None
+
+        # Levels being read on a worker thread
+        self.preloads: dict[str, tuple[int, Future]] = {}
+        self.prepared: dict[str, dict[str, Surface]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Timings of the last load, see LoadProfile
+        self.profile: Optional[LoadProfile] = None
+
+        # Load being run over several frames
+        self.loading: Optional[Iterator[float]] = None
+        self.progress = 1.0
 
     def load(self, level_name: str):
         """Load level parts such as GameObjects and Tiles."""
+        for _ in self.load_steps(level_name):
+            pass
+
+    def begin_load(self, level_name: str):
+        """Start loading a level a few steps at a time, see step."""
+        self.loading = self.load_steps(level_name)
+        self.progress = 0.0
+
+    def step(self, budget: float) -> bool:
+        """Run load steps for up to budget seconds.
+        Returns True once there is no load left to run. A load which
+        fails is dropped and reported, leaving the old level running."""
+        if self.loading is None:
+            return True
+        end = perf_counter() + budget
+        try:
+            while True:
+                self.progress = next(self.loading)
+                if perf_counter() >= end:
+                    return False
+        except StopIteration:
+            pass
+        except Exception as error:
+            cprint(f"level load failed: {error}", "red")
+        self.loading = None
+        self.progress = 1.0
+        return True
+
+    def load_steps(self, level_name: str) -> Iterator[float]:
+        """Load a level as resumable steps.
+        Yields the fraction of the load which has been done."""
         # Get level name
         level = path.join(self.paths["levels"], level_name + ".json")
-        if not path.exists(level):
+        fname = level_format.newest_level(level)
+        if not path.exists(fname):
             msg = (
                 "LEVEL ERROR\n"
                 f"path: {level}\n"
@@ -56,172 +139,582 @@ class LevelHandler(Component):
             )
             raise FileNotFoundError(colorize(msg, "red"))
 
-        # Load level file
+        # Load and parse level file
         level_name = path.join(self.paths["levels"], level_name)
-        file = open(level_name + ".json", "r")
-        contents = file.read()
-        file.close()
-
-        # Parse level data
-        level_data: list[list] = json.loads(contents)
-        obj_list = []
-
-        # Go through all objects
-        for obj in level_data:
-            # Parse all objects in list
-            name = obj[0]
-
-            # Tile layer
-            if name == "tile-layer":
-                layername, array, data = obj[1:4]
-                for column, _ in enumerate(array):
-                    for row, cell in enumerate(array[column]):
-                        if cell is not None:
-                            array[column][row] = tuple(cell)
-                data = dict(data)
-                obj_list.append([name, layername, array, data])
-
-            # Static collider
-            elif name == "static-collider":
-                array = obj[1]
-                obj_list.append([name, array])
-
-            # Any game object
-            else:
-                pos, key, data = obj[1:4]
-                pos = tuple(pos)
-                key = int(key)
-                data = dict(data)
-                obj_list.append([name, pos, key, data])
+        profile = LoadProfile(level_name)
+        mtime = stat(fname).st_mtime_ns
+        level_data = self.read(fname, profile)
+        total = len(level_data.layers) + len(level_data.objects) + 2
+        yield 1 / total
+
+        # Load the assets of the level, using tilemaps read while preloading
+        with profile.phase("assets"):
+            manifest = self.manifest(level_data)
+            prepared = self.prepared.pop(fname, None)
+            self.engine.assets.load(manifest, prepared)
+        profile.count("assets in manifest", len(manifest))
+
+        # Build the level off to the side while the old one stays live
+        live = self.engine.objects
+        staging = ObjectHandler(self.engine, live.create_object, self)
+        staging.ent.sobj = live.ent.sobj
+        staging.ent.take_keys(live.ent)
+        done = 1
+        streamed = self.streams(level_data)
+        if streamed:
+            phases = (
+                ("static collider", self.collider_steps(level_data)),
+                ("stream", staging.stream.begin(level_data)),
+            )
+        else:
+            phases = (
+                ("tile layers", self.layer_steps(level_data)),
+                ("static collider", self.collider_steps(level_data)),
+                ("objects", self.spawn_steps(level_data)),
+            )
+        for phase, steps in phases:
+            steps = self._staged(staging, steps)
+            for unit in profile.timed(phase, steps):
+                done += 1 if unit is None else unit
+                yield done / total
 
-        # Clear level
+        # Say level succesful level laod if level is no reloaded
         if self.current_level != level_name:
-            self.engine.assets.clear()
-        self.engine.objects.clear()
-
-        # Create level
-        for arg in obj_list:
-            name = arg[0]
-
-            # Create tile layers
-            if name == "tile-layer":
-                layer_name, array, data = arg[1:4]
-                self.engine.objects.tile.add(layer_name, data, array)
-
-            # Create static collider
-            elif name == "static-collider":
-                array = arg[1]
-                self.size = vec2d(len(array), len(array[0])) * self.fulltile
-                self.engine.objects.col.st.array.array = array
-
-                # Update camera level size to bind camera position
-                try:
-                    self.engine.cam.level_size
-                except AttributeError:
-                    msg = "Camera has no variable: level_size"
-                    cprint(msg, "yellow")
-                else:
-                    self.engine.cam.level_size = self.size
+            cprint("successful level load!", "green")
 
-            # Create object
-            else:
-                pos, key, data = arg[1:4]
-                pos = vec2d(*pos)
-                args = {"name": name, "pos": pos, "data": data, "key": key}
-                self.engine.objects.create_object(self.engine, **args)
+        # Swap the new level in and drop assets only the old one used
+        with profile.phase("swap"):
+            self.swap(staging)
+            self.engine.assets.keep(manifest)
 
-        # Render all layers after being built
+        # Update current level, keeping only the objects for resets so
+        # the grids are not held on top of the live layers and walls
+        self.current_level = level_name
+        self.current_file = fname
+        self.snapshot = level_data.objects_only()
+        self.snapshot_mtime = mtime
+        if streamed:
+            self.cache.pop(fname, None)
+            self.engine.objects.stream.level = self.snapshot
+
+        # Forget preloads of levels that were not loaded
+        for _, future in self.preloads.values():
+            future.cancel()
+        self.preloads.clear()
+        self.prepared.clear()
+        with profile.phase("create"):
+            self.engine.objects.ent.create()
+        self.record(profile)
+
+    def swap(self, objects: "ObjectHandler"):
+        """Make objects the engine's ObjectHandler.
+        Special objects pointing at the old walls are pointed at the new,
+        what the editor has hidden stays hidden, and the camera is only
+        bound to the new level from here on."""
+        live = self.engine.objects
+        sobj = objects.ent.sobj
+        for name, obj in sobj.items():
+            if obj is live.col.st:
+                sobj[name] = objects.col.st
+        objects.ent.visible = live.ent.visible
+        objects.tile.visible = live.tile.visible
+        objects.col.st.visible = live.col.st.visible
+        self.engine.objects = objects
+        self.fit_camera()
+
+    def _staged(self, objects: "ObjectHandler", steps: Iterator) -> Iterator:
+        """Run each step with objects as the engine's ObjectHandler so
+        everything built goes into it rather than the live level."""
+        steps = iter(steps)
+        while True:
+            live, self.engine.objects = self.engine.objects, objects
+            try:
+                value = next(steps)
+            except StopIteration:
+                return
+            finally:
+                self.engine.objects = live
+            yield value
+
+    def record(self, profile: LoadProfile):
+        """Count what a load made and hand the profile to debug."""
+        for obj in self.engine.objects.ent.obj.values():
+            name = type(obj).__name__
+            profile.objects[name] = profile.objects.get(name, 0) + 1
         for layer in self.engine.objects.tile.layers:
-            layer.cache()
+            if layer.chunks is None:
+                profile.count("layer surfaces")
+                surfaces = [layer.surface]
+                name = "layer surface bytes"
+            else:
+                # Streamed layers only hold the chunks rendered so far
+                profile.count("streamed layers")
+                surfaces = [chunk for chunk in layer.chunks.values() if chunk]
+                profile.count("chunk surfaces", len(surfaces))
+                name = "chunk surface bytes"
+            size = sum(
+                surface.get_width()
+                * surface.get_height()
+                * surface.get_bytesize()
+                for surface in surfaces
+            )
+            profile.count(name, size)
+        self.profile = profile
+        self.engine.debug.record_load(profile)
+
+    def streams(self, level: level_format.LevelData) -> bool:
+        """Whether a level is big enough to be streamed around the camera,
+        see StreamHandler."""
+        if self.stream_cells is None:
+            return False
+        cells = max((codes.size for _, _, codes in level.layers), default=0)
+        return cells > self.stream_cells
+
+    def manifest(self, level: level_format.LevelData) -> Manifest:
+        """Every asset used by the layers and objects of a level.
+        Objects only add assets if object_class can find their class."""
+        manifest = Manifest()
+        manifest.tilemaps = level.tilemap_ids()
+        if self.object_class is not None:
+            for name, _, _, data in level.objects:
+                obj_class = self.object_class(name)
+                if obj_class is not None:
+                    obj_class.add_assets(manifest, data)
+        return manifest
+
+    def preload(self, level_name: str):
+        """Start reading a level on a worker thread so a later load of
+        it only has to build. Does nothing if it is already cached."""
+        level = path.join(self.paths["levels"], level_name + ".json")
+        fname = level_format.newest_level(level)
+        if not path.exists(fname) or fname in self.preloads:
+            return
+        mtime = stat(fname).st_mtime_ns
+        cached = self.cache.get(fname)
+        if cached is not None and cached[0] == mtime:
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, "level-preload")
+        files = dict(self.engine.assets.tiles.files)
+        future = self._executor.submit(self._prepare, fname, files)
+        self.preloads[fname] = (mtime, future)
+
+    def read(
+        self, fname: str, profile: Optional[LoadProfile] = None
+    ) -> level_format.LevelData:
+        """Parse level file or reuse the cached parse if it is unchanged."""
+        if profile is None:
+            profile = LoadProfile(fname)
+        mtime = stat(fname).st_mtime_ns
+        try:
+            cached_mtime, level = self.cache[fname]
+        except KeyError:
+            pass
+        else:
+            if cached_mtime == mtime:
+                self.cache.move_to_end(fname)
+                profile.count("cache hits")
+                return level
+
+        with profile.phase("preload wait"):
+            level = self._consume_preload(fname, mtime)
+        if level is None:
+            level = self.parse(fname, profile)
+        self.cache[fname] = (mtime, level)
+        self.cache.move_to_end(fname)
+
+        # Evict least recently used levels, this one too if it is bigger
+        # than the whole cache
+        size = sum(cached.nbytes for _, cached in self.cache.values())
+        while size > self.cache_limit and self.cache:
+            _, (_, evicted) = self.cache.popitem(last=False)
+            size -= evicted.nbytes
+        return level
+
+    @staticmethod
+    def parse(fname: str, profile: LoadProfile) -> level_format.LevelData:
+        """Read and parse a level file, timing each part."""
+        if fname.endswith(".gxl"):
+            with profile.phase("read file"):
+                return level_format.read_binary(fname)
+
+        with profile.phase("read file"):
+            with open(fname, "r") as file:
+                text = file.read()
+        with profile.phase("json.loads"):
+            entries = json.loads(text)
+        with profile.phase("convert"):
+            level = level_format.from_json(entries)
+        cells = sum(codes.size for _, _, codes in level.layers)
+        profile.count("cells converted", cells + level.collider.size)
+        return level
+
+    def _prepare(self, fname: str, files: dict[int, str]):
+        """Worker thread: parse level and read the tilemaps it uses."""
+        level = level_format.read_level(fname)
+        tiles = self.engine.assets.tiles
+        tilemaps = tiles.read_tilemaps(files, level.tilemap_ids())
+        return level, tilemaps
+
+    def _consume_preload(
+        self, fname: str, mtime: int
+    ) -> Optional[level_format.LevelData]:
+        """Take a preloaded level, waiting if it is still being read."""
+        try:
+            preload_mtime, future = self.preloads.pop(fname)
+        except KeyError:
+            return None
+        if preload_mtime != mtime:
+            future.cancel()
+            return None
+        try:
+            level, tilemaps = future.result()
+        except Exception as error:
+            cprint(f"level preload failed: {error}", "yellow")
+            return None
+        self.prepared[fname] = tilemaps
+        return level
+
+    def build(self, level: level_format.LevelData):
+        """Create tile layers, walls and objects from parsed level data.
+        Grids and data are copied so the parsed level can be reused."""
+        for _ in self.build_steps(level):
+            pass
+        self.fit_camera()
+
+    def build_steps(self, level: level_format.LevelData) -> Iterator[int]:
+        """Build a level in small steps.
+        Yields 1 after each layer, the walls and each object, and 0 after
+        each part of a layer being rendered."""
+        yield from self.layer_steps(level)
+        yield from self.collider_steps(level)
+        for _ in self.spawn_steps(level):
+            yield 1
+
+    def layer_steps(self, level: level_format.LevelData) -> Iterator[int]:
+        """Create and render tile layers, see build_steps."""
+        tiles = self.engine.objects.tile
+        for i, (layer_name, data, codes) in enumerate(level.layers):
+            layer = tiles.add(layer_name, dict(data), codes, False)
+            images = level.images
+            if i >= len(images) or not layer.load_surface(images[i]):
+                for _ in layer.cache_steps():
+                    yield 0
+            yield 1
+
+    def collider_steps(self, level: level_format.LevelData) -> Iterator[int]:
+        """Create static collider, see fit_camera."""
+        self.engine.objects.col.st.array.array = level.collider
+        yield 1
+
+    def fit_camera(self):
+        """Size the level and camera bounds to the live walls."""
+        size = self.engine.objects.col.st.array.size
+        self.size = vec2d(*size) * self.fulltile
+
+        # Update camera level size to bind camera position
+        try:
+            self.engine.cam.level_size
+        except AttributeError:
+            msg = "Camera has no variable: level_size"
+            cprint(msg, "yellow")
+        else:
+            self.engine.cam.level_size = self.size
 
-        # Say level succesful level laod if level is no reloaded
-        if self.current_level != level_name:
-            cprint("successful level load!", "green")
+    def spawn(self, level: level_format.LevelData):
+        """Create the objects of a level from their spawn records."""
+        for _ in self.spawn_steps(level):
+            pass
 
-        # Update current level
-        self.current_level = level_name
-        self.engine.objects.ent.create()
+    def spawn_steps(self, level: level_format.LevelData) -> Iterator[None]:
+        for name, pos, key, data in level.objects:
+            pos = vec2d(*pos)
+            data = dict(data)
+            args = {"name": name, "pos": pos, "data": data, "key": key}
+            self.engine.objects.create_object(self.engine, **args)
+            yield
 
     def save(self, level_name: str):
         """Saves level to level path."""
-        # Compile level parts
-        obj_list = []
+        fname = path.join(self.paths["levels"], level_name + ".json")
+        self.cache.pop(fname, None)
+        level_format.write_entries(fname, self._save_entries())
+        cprint("successful level save!", "green")
 
+    def _save_entries(self) -> Iterator[list]:
+        """Build each level entry only when it is about to be written."""
         # Write layers
         for layer in self.engine.objects.tile.layers:
-            info = ["tile-layer", layer.name, layer.array._array, layer.data]
-            obj_list.append(info)
+            tiles = level_format.tiles_to_json(layer.array.codes)
+            yield ["tile-layer", layer.name, tiles, layer.data]
 
         # Write stcol
-        col = self.engine.objects.col.st
-        info = ["static-collider", col.array.array]
-        obj_list.append(info)
+        col = self.engine.objects.col.st.array.array
+        yield ["static-collider", level_format.collider_to_json(col)]
 
         # Write each object to file
         for key, obj in self.engine.objects.ent.obj.items():
-            info = [obj.name, obj.pos.ftup(), key, obj.data]
-            obj_list.append(info)
-
-        # Create json dump
-        new_list = []
-        for item in obj_list:
-            new_list.append(NoIndent(item))
-        data = json.dumps(new_list, indent=4, cls=NoIndentEncoder)
-        data.replace(",\n", ", \n")
-        if data.endswith("]]") or data.endswith("}]"):
-            data = data[1:-1] + "\n" + data[-1]
-
-        # Write to file
-        level = open(
-            path.join(self.paths["levels"], level_name + ".json"), "w"
-        )
-        level.write(data)
-        level.close()
-        cprint("successful level save!", "green")
+            yield [obj.name, obj.pos.ftup(), key, obj.data]
 
     def reset(self):
-        """Restart current level."""
-        self.load(self.current_level)
-
-
-class NoIndent(object):
-    """Value wrapper."""
-
-    def __init__(self, value):
-        self.value = value
-
+        """Restart current level.
+        Tile layers, walls and assets are kept and only the objects are
+        recreated from the snapshot taken when the level was loaded."""
+        if self.snapshot is None or not path.exists(self.current_file):
+            self.load(self.current_level)
+            return
+
+        # Fall back to a full load if the level file has changed
+        fname = level_format.newest_level(self.current_level + ".json")
+        if (
+            fname != self.current_file
+            or stat(fname).st_mtime_ns != self.snapshot_mtime
+        ):
+            self.load(self.current_level)
+            return
+
+        # Recreate objects
+        profile = LoadProfile(self.current_level + " (reset)")
+        with profile.phase("clear"):
+            self.engine.objects.ent.clear()
+            self.engine.objects.col.dy.clear()
+        with profile.phase("objects"):
+            if self.engine.objects.stream.active:
+                self.engine.objects.stream.restart()
+            else:
+                self.spawn(self.snapshot)
+        with profile.phase("create"):
+            self.engine.objects.ent.create()
+        self.record(profile)
+
+
+# Streaming
+class StreamHandler(Component):
+    """Streams a level around the camera in square chunks of tiles.
+    Only chunks near the camera have rendered tile surfaces and spawned
+    objects, so memory and the work done each frame depend on the view
+    rather than the size of the level.
+    Walls stay loaded for the whole level as they take a byte per cell
+    of the chunks holding walls, as do objects whose class is PERSISTENT
+    such as the player."""
+
+    CHUNK = 32  # tiles along each side of a chunk
+    LOAD_MARGIN = 1  # chunks loaded around the view
+    UNLOAD_MARGIN = 2  # chunks around the view kept loaded
 
-class NoIndentEncoder(json.JSONEncoder):
-    def __init__(self, *args, **kwargs):
-        super(NoIndentEncoder, self).__init__(*args, **kwargs)
-        self.kwargs = dict(kwargs)
-        del self.kwargs["indent"]
-        self._replacement_map = {}
+    def __init__(self, engine):
+        super().__init__(engine)
+        self.active = False
+        self.level: Optional[level_format.LevelData] = None
+
+        # Time spent loading chunks outside of the view each frame
+        self.budget = 0.25 / engine.FPS
+
+        # Object chunks, spawn record indices of each chunk and the live
+        # objects spawned from them
+        self.loaded: set[tuple[int, int]] = set()
+        self.spawns: dict[tuple[int, int], list[int]] = {}
+        self.alive: dict[int, Any] = {}
+        self.gone: set[int] = set()
+
+    @property
+    def chunk_size(self) -> int:
+        """Width of a chunk in pixels."""
+        return self.CHUNK * self.halftile
+
+    def begin(self, level: level_format.LevelData) -> Iterator[int]:
+        """Set up streaming a level in place of building all of it.
+        Yields like LevelHandler.build_steps."""
+        self.clear()
+        self.level = level
+
+        # Tile layers are rendered a chunk at a time as they come into view
+        tiles = self.engine.objects.tile
+        for layer_name, data, codes in level.layers:
+            layer = tiles.add(layer_name, dict(data), codes, False)
+            layer.chunks = {}
+            yield 1
+
+        # Sort spawn records into chunks
+        size = self.chunk_size
+        object_class = self.engine.objects.level.object_class
+        persistent = []
+        for i, (name, pos, _, _) in enumerate(level.objects):
+            obj_class = object_class(name) if object_class else None
+            if getattr(obj_class, "PERSISTENT", False):
+                persistent.append(i)
+            else:
+                chunk = (int(pos[0] // size), int(pos[1] // size))
+                self.spawns.setdefault(chunk, []).append(i)
+        self.active = True
+
+        for i in persistent:
+            self._spawn(i)
+            yield 1
+        for _ in range(len(level.objects) - len(persistent)):
+            yield 1
+
+    def restart(self):
+        """Respawn objects as if the level was just loaded.
+        Expects the entities to have been cleared already."""
+        self.loaded.clear()
+        self.alive.clear()
+        self.gone.clear()
+        object_class = self.engine.objects.level.object_class
+        for i, (name, _, _, _) in enumerate(self.level.objects):
+            obj_class = object_class(name) if object_class else None
+            if getattr(obj_class, "PERSISTENT", False):
+                self._spawn(i)
 
-    def default(self, o):
-        if isinstance(o, NoIndent):
-            key = uuid.uuid4().hex
-            self._replacement_map[key] = json.dumps(o.value, **self.kwargs)
-            return "@@%s@@" % (key,)
-        else:
-            return super(NoIndentEncoder, self).default(o)
+    def update(self):
+        """Unload chunks which have left the view and load those coming
+        into it. Chunks in view are always loaded, the rest are loaded
+        nearest first until the frame's budget is spent."""
+        if not self.active:
+            return
+        end = perf_counter() + self.budget
+        pending: list[tuple[float, Callable]] = []
+
+        # Tile layers, each with its own offset when using parallax
+        for layer in self.engine.objects.tile.layers:
+            if layer.chunks is None:
+                continue
+            offset = layer.offset()
+            bounds = self._bounds(layer.array.size, self.CHUNK)
+            keep = self._near(offset, self.UNLOAD_MARGIN, bounds)
+            for chunk in set(layer.chunks) - keep:
+                del layer.chunks[chunk]
+            for chunk in self._near(offset, self.LOAD_MARGIN, bounds):
+                if chunk not in layer.chunks:
+                    distance = self._distance(offset, chunk)
+                    load = self._layer_loader(layer, chunk)
+                    pending.append((distance, load))
+
+        # Objects
+        bounds = self._bounds(self.engine.objects.level.size, self.chunk_size)
+        keep = self._near(vec2d.zero(), self.UNLOAD_MARGIN, bounds)
+        self._unload_objects(keep)
+        for chunk in self._near(vec2d.zero(), self.LOAD_MARGIN, bounds):
+            if chunk not in self.loaded:
+                distance = self._distance(vec2d.zero(), chunk)
+                pending.append((distance, self._object_loader(chunk)))
+
+        # Load chunks in view, then the rest while there is time
+        pending.sort(key=lambda item: item[0])
+        for distance, load in pending:
+            if distance > 0 and perf_counter() >= end:
+                break
+            load()
 
-    def encode(self, o):
-        result = super(NoIndentEncoder, self).encode(o)
-        for k, v in iter(self._replacement_map.items()):
-            result = result.replace('"@@%s@@"' % (k,), v)
-        return result
+    def clear(self):
+        self.active = False
+        self.level = None
+        self.loaded.clear()
+        self.spawns.clear()
+        self.alive.clear()
+        self.gone.clear()
+
+    # Internal
+    def _near(
+        self, offset: vec2d, margin: int, bounds: tuple[int, int]
+    ) -> set[tuple[int, int]]:
+        """Chunks within margin chunks of the view of a layer drawn at
+        offset, clipped to bounds."""
+        cam = self.engine.cam
+        size = self.chunk_size
+        x, y = cam.pos.x - offset.x, cam.pos.y - offset.y
+        x0 = max(int(x // size) - margin, 0)
+        y0 = max(int(y // size) - margin, 0)
+        x1 = min(int((x + cam.size.x - 1) // size) + margin, bounds[0] - 1)
+        y1 = min(int((y + cam.size.y - 1) // size) + margin, bounds[1] - 1)
+        return {
+            (cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)
+        }
+
+    def _distance(self, offset: vec2d, chunk: tuple[int, int]) -> float:
+        """Distance in chunks from the view to a chunk, 0 when in view."""
+        cam = self.engine.cam
+        size = self.chunk_size
+        x, y = cam.pos.x - offset.x, cam.pos.y - offset.y
+        dx = max(x - (chunk[0] + 1) * size, chunk[0] * size - x - cam.size.x)
+        dy = max(y - (chunk[1] + 1) * size, chunk[1] * size - y - cam.size.y)
+        return max(dx, dy, 0) / size
+
+    @staticmethod
+    def _bounds(size, unit: int) -> tuple[int, int]:
+        """Number of chunks needed to cover size."""
+        return (int(-(-size[0] // unit)), int(-(-size[1] // unit)))
+
+    def _layer_loader(self, layer: "TileLayer", chunk: tuple[int, int]):
+        def load():
+            layer.chunks[chunk] = layer.render_chunk(*chunk, self.CHUNK)
+
+        return load
+
+    def _object_loader(self, chunk: tuple[int, int]):
+        def load():
+            self.loaded.add(chunk)
+            for i in self.spawns.get(chunk, ()):
+                if i not in self.alive and i not in self.gone:
+                    obj = self._spawn(i)
+                    try:
+                        obj.create()
+                    except AttributeError:
+                        pass
+
+        return load
+
+    def _spawn(self, i: int):
+        name, pos, key, data = self.level.objects[i]
+        args = {"name": name, "pos": vec2d(*pos), "data": dict(data)}
+        obj = self.engine.objects.create_object(self.engine, key=key, **args)
+        if obj is not None:
+            self.alive[i] = obj
+        return obj
+
+    def _unload_objects(self, keep: set[tuple[int, int]]):
+        """Remove objects which are no longer near the view and forget
+        those removed by the game so they are not spawned again."""
+        self.loaded &= keep
+        size = self.chunk_size
+        objects = self.engine.objects.ent.obj
+        for i, obj in list(self.alive.items()):
+            if objects.get(obj.key) is not obj:
+                del self.alive[i]
+                self.gone.add(i)
+                continue
+            if getattr(obj, "PERSISTENT", False):
+                continue
+            try:
+                pos = obj.pos
+            except AttributeError:
+                pos = vec2d(*self.level.objects[i][1])
+            if (int(pos.x // size), int(pos.y // size)) not in keep:
+                del self.alive[i]
+                try:
+                    obj.delete()
+                except AttributeError:
+                    self.engine.objects.ent.delete(obj.key)
 
 
 # Entity
 class EntityHandler(Component):
+    """Entities by key, with keys handed out by a free list.
+    Each key has a generation which is odd while the key is taken and
+    goes up every time the key is taken or freed, so a handle made by
+    handle stops resolving once its entity is deleted."""
+
     def __init__(self, engine):
         super().__init__(engine)
 
         self.obj: dict[int, Any] = {}
         self.sobj: dict[str, Any] = {}
 
-        self.pool = set(range(2 ** 12))
+        # Keys
+        self.generations: dict[int, int] = {}
+        self.free: list[int] = []  # may hold keys taken since being freed
+        self.next = 0  # no key below this is left for _get_key to find
 
         self.visible: bool = True
 
@@ -241,7 +734,7 @@ class EntityHandler(Component):
 
     def delete(self, key: int):
         del self.obj[key]
-        self.pool.add(key)
+        self._free_key(key)
 
     def update(self):
         objcopy = self.obj.copy()
@@ -261,7 +754,13 @@ class EntityHandler(Component):
 
     def clear(self):
         self.obj.clear()
-        self.pool = set(range(2 ** 12))
+        self._free_keys()
+
+    def take_keys(self, other: "EntityHandler"):
+        """Carry on the key generations of other with every key free, so
+        handles to other's entities stay stale in this handler."""
+        self.generations = dict(other.generations)
+        self._free_keys()
 
     # Creation
     def add(self, entity, key: int = None, check: bool = False):
@@ -271,13 +770,36 @@ class EntityHandler(Component):
             key = self._check_key(key)
         self.obj[key] = entity
 
+    # Handles
+    def handle(self, key: int) -> tuple[int, int]:
+        """Reference to the entity at key which goes stale when the
+        entity is deleted, see resolve."""
+        return (key, self.generations.get(key, 0))
+
+    def resolve(self, handle: tuple[int, int]) -> Optional[Any]:
+        """Entity a handle refers to, or None if it has been deleted."""
+        key, gen = handle
+        if self.generations.get(key, 0) == gen:
+            return self.obj.get(key)
+        return None
+
+    # Keys
     def _get_key(self) -> int:
-        return self.pool.pop()
+        # Reuse freed keys first, skipping any taken by _check_key since
+        while self.free:
+            key = self.free.pop()
+            if self._is_free(key):
+                return self._take_key(key)
+
+        # Then the lowest key not yet handed out
+        while not self._is_free(self.next):
+            self.next += 1
+        self.next += 1
+        return self._take_key(self.next - 1)
 
     def _check_key(self, key: int) -> int:
-        if key in self.pool:
-            self.pool.remove(key)
-            return key
+        if key is not None and key >= 0 and self._is_free(key):
+            return self._take_key(key)
         else:
             newkey = self._get_key()
             if key is not None:
@@ -285,6 +807,25 @@ class EntityHandler(Component):
                 cprint(f"replacing keys: {key} -> {newkey}!", "yellow")
             return newkey
 
+    def _is_free(self, key: int) -> bool:
+        return not self.generations.get(key, 0) & 1
+
+    def _take_key(self, key: int) -> int:
+        self.generations[key] = self.generations.get(key, 0) + 1
+        return key
+
+    def _free_keys(self):
+        self.generations = {
+            key: gen + (gen & 1) for key, gen in self.generations.items()
+        }
+        self.free.clear()
+        self.next = 0
+
+    def _free_key(self, key: int):
+        if not self._is_free(key):
+            self.generations[key] += 1
+            self.free.append(key)
+
 
 # Tile
 class TileHandler(Component):
@@ -301,16 +842,21 @@ class TileHandler(Component):
                 layer.draw(draw)
 
     # External
-    def add(self, name: str, data: dict = {}, array: list[list] = None):
-        """Add a new tile layer."""
+    def add(
+        self,
+        name: str,
+        data: dict = {},
+        array: Union[list[list], ndarray] = None,
+        cache: bool = True,
+    ) -> "TileLayer":
+        """Add a new tile layer.
+        array is a list of columns or an array of tile_array2d codes."""
         # Create layer
-        if array is None:
-            layer = TileLayer(self.engine, name, data)
-        else:
-            layer = TileLayer(self.engine, name, data, array)
+        layer = TileLayer(self.engine, name, data, array, cache)
 
         # Add layer
         self.layers.append(layer)
+        return layer
 
     def remove_layer(self, name: str):
         """Remove tile layer by name."""
@@ -325,19 +871,30 @@ class TileHandler(Component):
 
 class TileLayer(Component):
     def __init__(
-        self, engine, name: str, data: dict, array: list[list] = None
+        self,
+        engine,
+        name: str,
+        data: dict,
+        array: Union[list[list], ndarray] = None,
+        cache: bool = True,
     ):
         super().__init__(engine)
         self.name = name
         self.depth = 0
         self.visible = True
 
-        self.array = array2d((16, 16))
-        if array is not None:
+        self.array = tile_array2d((16, 16))
+        if isinstance(array, ndarray):
+            self.array.codes = array
+        elif array is not None:
             self.array.array = array
 
         self.surface: Surface = Surface((1, 1))
-        self.cache()
+        if cache:
+            self.cache()
+
+        # Chunk surfaces when streamed, None if the layer is one surface
+        self.chunks: Optional[dict[tuple[int, int], Optional[Surface]]] = None
 
         self.data = data
         self.update()
@@ -359,21 +916,30 @@ class TileLayer(Component):
     def draw(self, draw: Draw):
         """Draw tilelayer to screen."""
         if self.visible:
-            if self.engine.parallax and self.parallax != vec2d.zero():
-                pos = (self.engine.cam.pos * self.parallax).floor()
-            else:
-                pos = vec2d.zero()
-            draw.add(self.depth, self.surface, pos)
+            pos = self.offset()
+            if self.chunks is None:
+                draw.add(self.depth, self.surface, pos)
+                return
+            for (x, y), surface in self.chunks.items():
+                if surface is not None:
+                    size = surface.get_width()
+                    draw.add(self.depth, surface, pos + vec2d(x, y) * size)
+
+    def offset(self) -> vec2d:
+        """Position the layer is drawn at."""
+        if self.engine.parallax and self.parallax != vec2d.zero():
+            return (self.engine.cam.pos * self.parallax).floor()
+        return vec2d.zero()
 
     # External Interactions
     def place(self, pos: vec2d, tilemap_id: int, tile_id: int):
         """Add tiles to grid on the layer."""
-        x, y = (pos // (self.fulltile // 2)).ftup()
+        x, y = f_cell(pos, self.halftile)
         self.array.set(x, y, (tilemap_id, tile_id))
 
     def remove(self, pos: vec2d):
         """Remove tiles from the grid on the grid."""
-        x, y = (pos // (self.fulltile // 2)).ftup()
+        x, y = f_cell(pos, self.halftile)
         try:
             self.array.delete(x, y)
         except IndexError:
@@ -384,50 +950,89 @@ class TileLayer(Component):
         self.array.minimize()
 
     # Caching
+    def load_surface(self, fname: str) -> bool:
+        """Use a pre-rendered image of the layer instead of rendering it.
+        Returns False if the image is missing or does not fit the grid."""
+        if not path.exists(fname):
+            return False
+        surface = image.load(fname)
+        size = (vec2d(*self.array.size) * self.halftile).ftup()
+        if surface.get_size() != size:
+            return False
+        self.surface = surface.convert_alpha()
+        return True
+
+    def render_chunk(self, x: int, y: int, size: int) -> Optional[Surface]:
+        """Render the size by size tiles of chunk (x, y) to a surface.
+        Returns None if the chunk has no tiles."""
+        x0, y0 = x * size, y * size
+        codes = self.array.codes_in(x0, y0, size, size)
+        xs, ys = nonzero(codes)
+        if not len(xs):
+            return None
+        surface = Surface((size * self.halftile,) * 2).convert_alpha()
+        surface.fill((0, 0, 0, 0))
+        decode = self.array.decode
+        get = self.engine.assets.tiles.get
+        cells = codes[xs, ys].tolist()
+        for cx, cy, code in zip(xs.tolist(), ys.tolist(), cells):
+            pos = (cx * self.halftile, cy * self.halftile)
+            surface.blit(get(decode(code)), pos)
+        return surface
+
     def cache(self):
+        for _ in self.cache_steps():
+            pass
+
+    def cache_steps(self, count: int = 256) -> Iterator[None]:
+        """Render the layer, yielding after every count tiles."""
         surface_size = (vec2d(*self.array.size) * self.halftile).ftup()
         self.surface = Surface(surface_size).convert_alpha()
         self.surface.fill((0, 0, 0, 0))
 
-        # Iterate through array
-        for x in range(self.array.width):
-            for y in range(self.array.height):
-                tile_info = self.array.get(x, y)
-                if isinstance(tile_info, tuple):
-                    tile = self.engine.assets.tiles.get(tile_info)
-                    pos = (x * self.halftile, y * self.halftile)
-                    self.surface.blit(tile, pos)
+        # Iterate through placed tiles
+        for i, (x, y, tile_info) in enumerate(self.array.items(), 1):
+            if isinstance(tile_info, tuple):
+                tile = self.engine.assets.tiles.get(tile_info)
+                pos = (x * self.halftile, y * self.halftile)
+                self.surface.blit(tile, pos)
+            if i % count == 0:
+                yield
 
     def cache_partial(self, pos: vec2d):
         """Cache tile to Surface."""
-        x, y = (pos // self.halftile).ftup()
+        x, y = f_cell(pos, self.halftile)
         try:
             tile_info = self.array.get(x, y)
         except IndexError:
             pass
         else:
             # Replace singular tile
+            tile_pos = (x * self.halftile, y * self.halftile)
             if tile_info is None:  # Clear tile at position
                 color = (0, 0, 0, 0)
-                rect = Rect(pos.ftup(), (vec2d(1, 1) * self.halftile).ftup())
+                rect = Rect(tile_pos, (self.halftile, self.halftile))
                 pydraw.rect(self.surface, color, rect)
 
             elif isinstance(tile_info, tuple):  # Draw tile at position
                 tile = self.engine.assets.tiles.get(tile_info)
-                size = vec2d(*self.surface.get_size()) // 16
+                width, height = self.surface.get_size()
+                width //= self.halftile
+                height //= self.halftile
 
-                if x >= size.x or y >= size.y:
+                if x >= width or y >= height:
                     # Create new larger surface with old data
-                    new_size = vec2d(
-                        max(x + 1, size.x) * 16, max(y + 1, size.y) * 16
+                    new_size = (
+                        max(x + 1, width) * self.halftile,
+                        max(y + 1, height) * self.halftile,
                     )
-                    new_surface = Surface(new_size.ftup()).convert_alpha()
+                    new_surface = Surface(new_size).convert_alpha()
                     new_surface.fill((0, 0, 0, 0))
                     new_surface.blit(self.surface, (0, 0))
                     self.surface = new_surface
 
                 # Draw tile
-                self.surface.blit(tile, pos.ftup())
+                self.surface.blit(tile, tile_pos)
 
 
 # Collision
@@ -443,25 +1048,22 @@ class StaticCollider(Component, Entity):
 
     def __init__(self, engine):
         super().__init__(engine)
-        self.array = array2d((16, 16))
+        self.array = bool_array2d((16, 16))
         self.visible = True
 
     def add(self, pos: vec2d):
         """Add a wall at a given position."""
-        pos //= self.fulltile
-        x, y = pos.ftup()
+        x, y = f_cell(pos, self.fulltile)
         self.array.set(x, y, True)
 
     def remove(self, pos: vec2d):
         """Remove a wall at a given position."""
-        pos //= self.fulltile
-        x, y = pos.ftup()
+        x, y = f_cell(pos, self.fulltile)
         self.array.delete(x, y)
 
     def get(self, pos: vec2d) -> bool:
         """Check for a collision at a given position."""
-        pos //= self.fulltile
-        x, y = pos.ftup()
+        x, y = f_cell(pos, self.fulltile)
         try:
             if self.array.get(x, y):
                 return True
@@ -470,25 +1072,42 @@ class StaticCollider(Component, Entity):
         except IndexError:
             return False
 
+    def get_rect(self, pos: vec2d, size: vec2d) -> bool:
+        """Check for a collision anywhere inside of a rectangle."""
+        tile = self.fulltile
+        x1 = int((pos.x + size.x - 1e-6) // tile) + 1
+        y1 = int((pos.y + size.y - 1e-6) // tile) + 1
+        x0, y0 = int(pos.x // tile), int(pos.y // tile)
+        return self.array.any_in(x0, y0, x1, y1)
+
     def clear(self):
         """Clear all Static collision points off of grid"""
-        self.array = array2d((16, 16))
+        self.array = bool_array2d((16, 16))
 
     def draw(self, draw: Draw):
-        size = (vec2d(*self.array.size) * self.fulltile).ftup()
-        surface = Surface(size).convert_alpha()
+        if not self.visible:
+            return
+
+        # Only draw the walls inside of the camera
+        tile = self.fulltile
+        cam = self.engine.cam
+        x, y = f_cell(cam.pos, tile)
+        width = int(cam.size.x // tile) + 2
+        height = int(cam.size.y // tile) + 2
+        view = self.array.view(x, y, width, height)
+        if not (view.width and view.height):
+            return
+
+        surface = Surface((view.width * tile, view.height * tile))
+        surface = surface.convert_alpha()
         surface.fill((0, 0, 0, 0))
         color = (16, 16, 16)
-        size = (vec2d(1, 1) * self.fulltile).ftup()
-        if self.visible:
-            for x in range(self.array.width):
-                for y in range(self.array.height):
-                    if self.array.get(x, y):
-                        pos = vec2d(x, y) * self.fulltile
-                        rect = Rect(pos.ftup(), size)
-                        pydraw.rect(surface, color, rect)
-            pos = vec2d(0, 0)
-            draw.add(0, pos=pos, surface=surface)
+        size = (tile, tile)
+        for x, y, _ in view.items():
+            rect = Rect((x * tile, y * tile), size)
+            pydraw.rect(surface, color, rect)
+        pos = vec2d(view.x * tile, view.y * tile)
+        draw.add(0, pos=pos, surface=surface)
 
     def minimize(self):
         self.array.minimize()
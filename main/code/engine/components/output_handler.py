@@ -1,8 +1,9 @@
+from math import floor
 from os import path
 from typing import Union
 
 from main.code.engine.constants import colorize, cprint
-from main.code.engine.types import Component, vec2d
+from main.code.engine.types import AABB, Component, vec2d
 from pygame import DOUBLEBUF, HWSURFACE, display, mixer
 from pygame.surface import Surface
 
@@ -187,6 +188,7 @@ class Camera(Component):
         self.level_size = size
         self._pos = vec2d(0, 0)
         self._surface = Surface(size.ftup())
+        self.view = AABB(0, 0, size.x, size.y)
 
     @property
     def pos(self) -> vec2d:
@@ -207,14 +209,17 @@ class Camera(Component):
         gui: bool = False,
         special_flags: int = 0,
     ):
-        """Draws a surface at a position."""
+        """Draws a surface at a position.
+        Surfaces entirely outside of the view are culled."""
         if gui:
-            self._surface.blit(
-                surface, pos.ftup(), special_flags=special_flags
-            )
+            x, y = pos.x, pos.y
         else:
+            cam = self.pos
+            x, y = pos.x - cam.x, pos.y - cam.y
+        width, height = surface.get_size()
+        if self.view.overlap_rect(x, y, width, height):
             self._surface.blit(
-                surface, (pos - self.pos).ftup(), special_flags=special_flags
+                surface, (floor(x), floor(y)), special_flags=special_flags
             )
 
     def blank(self):
@@ -0,0 +1,55 @@
+"""Level transitions requested by objects and events."""
+
+from typing import Optional
+
+from main.code.engine.constants import cprint
+from main.code.engine.types import Component
+
+
+class TransitionHandler(Component):
+    """Collects level loads and resets requested during a frame and runs
+    one of them at a safe point in the main loop, see run.
+    Repeated requests collapse into one, a load beats a reset and the
+    first level asked for beats any other."""
+
+    def __init__(self, engine):
+        super().__init__(engine)
+        # ("load", level name) or ("reset", None)
+        self.pending: Optional[tuple[str, Optional[str]]] = None
+        self.collapsed = 0
+
+    def load(self, level_name: str):
+        """Request loading a level."""
+        self._request(("load", level_name))
+
+    def reset(self):
+        """Request restarting the current level."""
+        self._request(("reset", None))
+
+    def run(self) -> bool:
+        """Start the pending transition, if any.
+        Requests made while a level is loading are dropped.
+        Returns True if a transition was started."""
+        request, self.pending = self.pending, None
+        self.collapsed = 0
+        level = self.engine.objects.level
+        if request is None or level.loading is not None:
+            return False
+
+        kind, level_name = request
+        if kind == "load":
+            level.begin_load(level_name)
+        else:
+            level.reset()
+        return True
+
+    def _request(self, request: tuple[str, Optional[str]]):
+        pending = self.pending
+        if pending is None or (pending[0] == "reset" and request[0] == "load"):
+            self.pending = request
+            return
+
+        self.collapsed += 1
+        if request[0] == "load" and request != pending:
+            msg = f"level {request[1]} ignored, already loading {pending[1]}"
+            cprint(msg, "yellow")
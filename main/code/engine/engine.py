@@ -12,6 +12,7 @@ from main.code.engine.components import (
     ObjectHandler,
     Debug,
     Settings,
+    TransitionHandler,
 )
 from main.code.engine.constants import colorize
 from main.code.engine.types import vec2d
@@ -77,6 +78,7 @@ class Engine:
         self.output = OutputHandler(self, size)
         self.assets = AssetHandler(self)
         self.objects = ObjectHandler(self, create_object)
+        self.transitions = TransitionHandler(self)
         self.debug = Debug(self, debug)
         self.settings = Settings(self)
         self.cam = self.output.cam
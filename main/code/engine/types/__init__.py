@@ -1,3 +1,8 @@
-from .array import array2d
+from .aabb import AABB
+from .array import array2d, array2d_view
+from .bool_array import bool_array2d
 from .component import Component
-from .vector import vec2d
+from .sparse_array import sparse_array2d
+from .tile_array import tile_array2d
+from .vector import vec2d, frozenvec2d
+from .vector_array import vec2d_array
@@ -0,0 +1,156 @@
+"""Axis aligned bounding box."""
+
+from __future__ import annotations
+from typing import Optional
+
+from .vector import vec2d
+
+
+class AABB:
+    """Axis aligned bounding box stored by its edges.
+    Edges are half open like pygame.Rect so boxes which only touch do
+    not overlap. Scalar methods (overlap_rect, contains_point) exist so
+    hot loops can test without building a second box."""
+
+    __slots__ = ("left", "top", "right", "bottom")
+
+    def __init__(self, x: float, y: float, width: float, height: float):
+        self.left = x
+        self.top = y
+        self.right = x + width
+        self.bottom = y + height
+
+    @classmethod
+    def from_vec(cls, pos: vec2d, size: vec2d) -> AABB:
+        return cls(pos.x, pos.y, size.x, size.y)
+
+    @classmethod
+    def from_edges(
+        cls, left: float, top: float, right: float, bottom: float
+    ) -> AABB:
+        box = cls.__new__(cls)
+        box.left = left
+        box.top = top
+        box.right = right
+        box.bottom = bottom
+        return box
+
+    # Magic methods
+    def __eq__(self, other) -> bool:
+        if isinstance(other, AABB):
+            return (
+                self.left == other.left
+                and self.top == other.top
+                and self.right == other.right
+                and self.bottom == other.bottom
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"AABB({self.left!r}, {self.top!r}, "
+            f"{self.width!r}, {self.height!r})"
+        )
+
+    # Properties
+    @property
+    def x(self) -> float:
+        return self.left
+
+    @property
+    def y(self) -> float:
+        return self.top
+
+    @property
+    def width(self) -> float:
+        return self.right - self.left
+
+    @property
+    def height(self) -> float:
+        return self.bottom - self.top
+
+    @property
+    def pos(self) -> vec2d:
+        return vec2d(self.left, self.top)
+
+    @property
+    def size(self) -> vec2d:
+        return vec2d(self.right - self.left, self.bottom - self.top)
+
+    def empty(self) -> bool:
+        return self.right <= self.left or self.bottom <= self.top
+
+    def tup(self) -> tuple[float, float, float, float]:
+        """(x, y, width, height) as accepted by pygame.Rect."""
+        return (self.left, self.top, self.width, self.height)
+
+    # Tests
+    def overlap(self, other: AABB) -> bool:
+        return (
+            self.left < other.right
+            and self.right > other.left
+            and self.top < other.bottom
+            and self.bottom > other.top
+        )
+
+    def overlap_rect(
+        self, x: float, y: float, width: float, height: float
+    ) -> bool:
+        """Overlap test against a box given as scalars."""
+        return (
+            self.left < x + width
+            and self.right > x
+            and self.top < y + height
+            and self.bottom > y
+        )
+
+    def contains_point(self, x: float, y: float) -> bool:
+        return self.left <= x < self.right and self.top <= y < self.bottom
+
+    def collidepoint(self, pos: vec2d) -> bool:
+        return self.contains_point(pos.x, pos.y)
+
+    # Combining
+    def intersection(self, other: AABB) -> Optional[AABB]:
+        """Overlapping area or None if the boxes do not overlap."""
+        left = max(self.left, other.left)
+        top = max(self.top, other.top)
+        right = min(self.right, other.right)
+        bottom = min(self.bottom, other.bottom)
+        if right <= left or bottom <= top:
+            return None
+        return AABB.from_edges(left, top, right, bottom)
+
+    def union(self, other: AABB) -> AABB:
+        """Smallest box containing both boxes."""
+        return AABB.from_edges(
+            min(self.left, other.left),
+            min(self.top, other.top),
+            max(self.right, other.right),
+            max(self.bottom, other.bottom),
+        )
+
+    def clip(self, viewport: AABB) -> Optional[AABB]:
+        """Part of the box inside of the viewport or None if culled."""
+        return self.intersection(viewport)
+
+    # Transforms
+    def expand(self, dx: float, dy: float = None) -> AABB:
+        """Grow every edge outwards, negative values shrink."""
+        if dy is None:
+            dy = dx
+        return AABB.from_edges(
+            self.left - dx, self.top - dy, self.right + dx, self.bottom + dy
+        )
+
+    def move(self, dx: float, dy: float) -> AABB:
+        return AABB.from_edges(
+            self.left + dx, self.top + dy, self.right + dx, self.bottom + dy
+        )
+
+    def move_to(self, x: float, y: float):
+        """Move in place so the top left is at (x, y)."""
+        self.right += x - self.left
+        self.bottom += y - self.top
+        self.left = x
+        self.top = y
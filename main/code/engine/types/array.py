@@ -1,20 +1,25 @@
-from typing import Union
+from __future__ import annotations
+from typing import Iterator, Union
 
 
 from .vector import vec2d
 
 
 def f_is_list_empty(list: list):
-    for element in list:
-        if element is not None:
-            return False
-    return True
+    return list.count(None) == len(list)
 
 
 class array2d:
+    """Dense 2D array stored as a list of columns.
+    Storage grows by doubling so the logical size can be smaller than
+    the allocated capacity; cells outside of the size are always None."""
+
+    EMPTY = None
+
     def __init__(self, size: tuple[int, int]):
         self._array = [[None] * size[1] for _ in range(size[0])]
         self._size = size
+        self._capacity = size
 
     def __str__(self):
         string = []
@@ -26,12 +31,16 @@ class array2d:
 
     @property
     def array(self):
-        return self._array
+        if self._capacity == self._size:
+            return self._array
+        width, height = self._size
+        return [column[:height] for column in self._array[:width]]
 
     @array.setter
     def array(self, array: list[list]):
         self._array = array
         self._size = (len(array), len(array[0]))
+        self._capacity = self._size
 
     @property
     def size(self) -> tuple[int, int]:
@@ -39,13 +48,31 @@ class array2d:
 
     @size.setter
     def size(self, size: tuple[int, int]):
-        new = array2d(size)
-        for x in range(min(self.size[0], size[0])):
-            for y in range(min(self.size[1], size[1])):
-                new.set(x, y, self.get(x, y))
-        self._array = new._array
+        width, height = size
+        old_width, old_height = self._size
+        if width <= old_width and height <= old_height:
+            # Shrink, copying only the cells which are kept
+            self._array = [
+                column[:height] for column in self._array[:width]
+            ]
+            self._capacity = size
+        else:
+            # Clear cells which leave the logical area then grow
+            if height < old_height:
+                blank = [None] * (old_height - height)
+                for column in self._array[:old_width]:
+                    column[height:old_height] = blank
+            if width < old_width:
+                blank = [None] * old_height
+                for column in self._array[width:old_width]:
+                    column[:old_height] = blank
+            self._reserve(width, height)
         self._size = size
 
+    @property
+    def capacity(self) -> tuple[int, int]:
+        return self._capacity
+
     @property
     def width(self) -> int:
         return self.size[0]
@@ -56,18 +83,23 @@ class array2d:
 
     def minimize(self):
         width, height = self.size
-        for x in range(1, self.size[0]):
-            column = self.get_column(width - x)
-            if not f_is_list_empty(column):
-                width = self.width - x + 1
-                break
-        for y in range(1, self.size[1]):
-            row = self.get_row(height - y)
-            if not f_is_list_empty(row):
-                height = self.height - y + 1
-                break
-
-        self.size = (width, height)
+        columns = self._array[:width]
+
+        # Last column with any cell
+        while width > 1 and f_is_list_empty(columns[width - 1][:height]):
+            width -= 1
+
+        # Last row with any cell, only scanning below the best found so far
+        new_height = 1
+        for column in columns[:width]:
+            tail = column[new_height:height]
+            if not f_is_list_empty(tail):
+                for y in range(len(tail) - 1, -1, -1):
+                    if tail[y] is not None:
+                        new_height += y + 1
+                        break
+
+        self.size = (width, new_height)
 
     def get(self, x: int, y: int):
         if self._bounded((x, y)):
@@ -76,6 +108,8 @@ class array2d:
 
     def set(self, x: int, y: int, value):
         if not self._bounded((x, y)):
+            if x < 0 or y < 0:
+                raise IndexError(f"no point ({x}, {y})")
             self.size = (max(x + 1, self.size[0]), max(y + 1, self.size[1]))
         self._array[x][y] = value
 
@@ -85,18 +119,169 @@ class array2d:
 
     def get_column(self, x: int):
         if self._bounded((x, 0)):
-            return self._array[x]
+            return self._array[x][: self.height]
         raise IndexError(f"no column {x}")
 
     def get_row(self, y: int):
         if self._bounded((0, y)):
-            return [column[y] for column in self._array]
+            return [column[y] for column in self._array[: self.width]]
         raise IndexError(f"no row {y}")
 
     def fill(self, value):
-        self._array = [[value] * self.height for _ in range(self.width)]
+        width, height = self.size
+        row = [value] * height
+        for column in self._array[:width]:
+            column[:height] = row
+
+    def items(self):
+        """Yield (x, y, value) for every cell which is not None."""
+        width, height = self.size
+        for x, column in enumerate(self._array[:width]):
+            for y, value in enumerate(column[:height]):
+                if value is not None:
+                    yield (x, y, value)
+
+    def view(self, x: int, y: int, width: int, height: int) -> array2d_view:
+        """Rectangular window into the array which shares its storage."""
+        return array2d_view(self, x, y, width, height)
+
+    def _get_span(self, x: int, y0: int, y1: int) -> list:
+        return self._array[x][y0:y1]
+
+    def _set_span(self, x: int, y0: int, values: list):
+        self._array[x][y0 : y0 + len(values)] = values
+
+    def _reserve(self, width: int, height: int):
+        """Grow capacity to fit (width, height), at least doubling."""
+        capacity_width, capacity_height = self._capacity
+        if height > capacity_height:
+            height = max(height, capacity_height * 2)
+            blank = [None] * (height - capacity_height)
+            for column in self._array:
+                column.extend(blank)
+        else:
+            height = capacity_height
+        if width > capacity_width:
+            width = max(width, capacity_width * 2)
+            for _ in range(width - capacity_width):
+                self._array.append([None] * height)
+        else:
+            width = capacity_width
+        self._capacity = (width, height)
+
+    def _bounded(self, point: Union[vec2d, tuple]):
+        if 0 <= point[0] < self.size[0] and 0 <= point[1] < self.size[1]:
+            return True
+        return False
+
+
+class array2d_view:
+    """Rectangular window into an array2d, bool_array2d or tile_array2d.
+    The window is clipped to the array when created and coordinates are
+    relative to its top left. Reads and writes go straight to the array
+    so work scales with the window, not the array."""
+
+    def __init__(self, owner, x: int, y: int, width: int, height: int):
+        self.owner = owner
+        x0, y0 = max(x, 0), max(y, 0)
+        x1 = min(x + width, owner.width)
+        y1 = min(y + height, owner.height)
+        self.x, self.y = x0, y0
+        self._size = (max(x1 - x0, 0), max(y1 - y0, 0))
+
+    def __str__(self):
+        string = []
+        string.append("[")
+        for y in range(self.height):
+            string.append("\t" + str(self.get_row(y)))
+        string.append("]")
+        return "\n".join(string)
+
+    def __iter__(self) -> Iterator[list]:
+        """Iterate over the columns of the window."""
+        get_span = self.owner._get_span
+        y0, y1 = self.y, self.y + self.height
+        for x in range(self.x, self.x + self.width):
+            yield get_span(x, y0, y1)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self._size
+
+    @property
+    def width(self) -> int:
+        return self._size[0]
+
+    @property
+    def height(self) -> int:
+        return self._size[1]
+
+    @property
+    def pos(self) -> tuple[int, int]:
+        """Top left of the window in the owning array."""
+        return (self.x, self.y)
+
+    def get(self, x: int, y: int):
+        if self._bounded((x, y)):
+            return self.owner.get(self.x + x, self.y + y)
+        raise IndexError(f"no point ({x}, {y})")
+
+    def set(self, x: int, y: int, value):
+        if self._bounded((x, y)):
+            self.owner.set(self.x + x, self.y + y, value)
+        else:
+            raise IndexError(f"no point ({x}, {y})")
+
+    def get_row(self, y: int) -> list:
+        if self._bounded((0, y)):
+            return [column[y] for column in self]
+        raise IndexError(f"no row {y}")
+
+    def items(self):
+        """Yield (x, y, value) for every cell which is not empty."""
+        empty = self.owner.EMPTY
+        for x, column in enumerate(self):
+            for y, value in enumerate(column):
+                if value is not empty:
+                    yield (x, y, value)
+
+    def fill(self, value):
+        column = [value] * self.height
+        set_span = self.owner._set_span
+        for x in range(self.x, self.x + self.width):
+            set_span(x, self.y, column)
+
+    def copy(self) -> array2d:
+        """Copy the window out to a new array2d."""
+        new = array2d((1, 1))
+        if self.width and self.height:
+            new.array = list(self)
+        return new
+
+    def paste(self, source, x: int = 0, y: int = 0):
+        """Write an array or list of columns into the window at (x, y).
+        Cells which fall outside of the window are dropped."""
+        if isinstance(source, array2d_view):
+            source = list(source)
+        elif not isinstance(source, list):
+            source = source.array
+            if not isinstance(source, list):
+                source = source.tolist()
+        set_span = self.owner._set_span
+        src_y0 = max(-y, 0)
+        src_y1 = min(self.height - y, len(source[0]) if source else 0)
+        if src_y0 >= src_y1:
+            return
+        for src_x, column in enumerate(source):
+            dest_x = x + src_x
+            if 0 <= dest_x < self.width:
+                set_span(
+                    self.x + dest_x,
+                    self.y + y + src_y0,
+                    column[src_y0:src_y1],
+                )
 
     def _bounded(self, point: Union[vec2d, tuple]):
-        if point[0] + 1 <= self.size[0] and point[1] + 1 <= self.size[1]:
+        if 0 <= point[0] < self._size[0] and 0 <= point[1] < self._size[1]:
             return True
         return False
@@ -0,0 +1,117 @@
+from __future__ import annotations
+from typing import Iterator, Union
+
+from numpy import asarray, ndarray
+
+from .array import array2d_view
+from .sparse_array import sparse_array2d
+from .vector import vec2d
+
+
+class bool_array2d:
+    """2D array of booleans kept in sparse_array2d chunks of NumPy bools.
+    Uses one byte per cell of the chunks which hold walls rather than a
+    Python object per cell and answers region queries in bulk.
+    Has the same interface as array2d with empty cells reading False."""
+
+    EMPTY = False
+
+    def __init__(self, size: tuple[int, int]):
+        self._cells = sparse_array2d(size, bool)
+
+    def __str__(self):
+        string = []
+        string.append("[")
+        for y in range(self.height):
+            string.append("\t" + str(self.get_row(y)))
+        string.append("]")
+        return "\n".join(string)
+
+    @property
+    def array(self) -> ndarray:
+        """Dense copy of the logical area indexed as [x, y]."""
+        return self._cells.dense()
+
+    @array.setter
+    def array(self, array: Union[list[list], ndarray]):
+        self._cells = sparse_array2d.from_dense(asarray(array, dtype=bool))
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self._cells.size
+
+    @size.setter
+    def size(self, size: tuple[int, int]):
+        self._cells.size = size
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self._cells.nbytes
+
+    def minimize(self):
+        self._cells.minimize()
+
+    def get(self, x: int, y: int) -> bool:
+        width, height = self._cells.size
+        if 0 <= x < width and 0 <= y < height:
+            return self._cells.get(x, y)
+        raise IndexError(f"no point ({x}, {y})")
+
+    def set(self, x: int, y: int, value):
+        if not self._bounded((x, y)):
+            if x < 0 or y < 0:
+                raise IndexError(f"no point ({x}, {y})")
+            self.size = (max(x + 1, self.size[0]), max(y + 1, self.size[1]))
+        self._cells.set(x, y, bool(value))
+
+    def delete(self, x: int, y: int):
+        if self._bounded((x, y)):
+            self._cells.set(x, y, False)
+
+    def get_column(self, x: int) -> list[bool]:
+        if self._bounded((x, 0)):
+            return self._get_span(x, 0, self.height)
+        raise IndexError(f"no column {x}")
+
+    def get_row(self, y: int) -> list[bool]:
+        if self._bounded((0, y)):
+            return self._cells.region(0, y, self.width, y + 1)[:, 0].tolist()
+        raise IndexError(f"no row {y}")
+
+    def fill(self, value):
+        self._cells.fill(bool(value))
+
+    def items(self) -> Iterator[tuple[int, int, bool]]:
+        """Yield (x, y, True) for every set cell."""
+        for x, y, _ in self._cells.items():
+            yield (x, y, True)
+
+    def view(self, x: int, y: int, width: int, height: int) -> array2d_view:
+        """Rectangular window into the array which shares its storage."""
+        return array2d_view(self, x, y, width, height)
+
+    # Region queries
+    def any_in(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Whether any cell in [x0, x1) by [y0, y1) is set.
+        The region is clipped to the array, outside counts as empty."""
+        return self._cells.any_in(x0, y0, x1, y1)
+
+    # Internal
+    def _get_span(self, x: int, y0: int, y1: int) -> list[bool]:
+        return self._cells.region(x, y0, x + 1, y1)[0].tolist()
+
+    def _set_span(self, x: int, y0: int, values: list):
+        self._cells.set_region(x, y0, asarray([values], dtype=bool))
+
+    def _bounded(self, point: Union[vec2d, tuple]):
+        if 0 <= point[0] < self.size[0] and 0 <= point[1] < self.size[1]:
+            return True
+        return False
@@ -1,9 +1,18 @@
+from main.code.engine.components.asset_handler import Manifest
 from main.code.engine.components.output_handler import Draw
 
 
 class Entity:
     """Base class for all game entities."""
 
+    # Assets loaded with any level the entity is in, see add_assets
+    SPRITES: tuple[str, ...] = ()
+    ALPHA = False
+    SFX: tuple[str, ...] = ()
+
+    # Kept loaded while a level streams around the camera
+    PERSISTENT = False
+
     def __init__(self, engine, key: int, name: str, data: dict):
         from main.code.engine.engine import Engine
 
@@ -12,6 +21,12 @@ class Entity:
         self.name = name
         self.data = data
 
+    @classmethod
+    def add_assets(cls, manifest: Manifest, data: dict):
+        """Add the assets an entity created with data uses to manifest."""
+        manifest.sprites.update((name, cls.ALPHA) for name in cls.SPRITES)
+        manifest.sfx.update(cls.SFX)
+
     def post_init(self):
         pass
 
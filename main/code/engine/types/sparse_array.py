@@ -0,0 +1,173 @@
+from __future__ import annotations
+from typing import Iterator
+
+from numpy import dtype, flatnonzero, full, ndarray, zeros
+
+
+class sparse_array2d:
+    """2D NumPy array stored as fixed size chunks which are created on
+    demand. Cells in missing chunks are 0 and chunks are dropped once
+    empty, so memory scales with the set cells rather than the size.
+    Backing store of tile_array2d and bool_array2d, which check bounds;
+    cells are indexed as [x, y]."""
+
+    CHUNK_SHIFT = 5
+    CHUNK_SIZE = 1 << CHUNK_SHIFT
+    CHUNK_MASK = CHUNK_SIZE - 1
+
+    def __init__(self, size: tuple[int, int], cell_type):
+        self.dtype = dtype(cell_type)
+        self.chunks: dict[tuple[int, int], ndarray] = {}
+        self._size = size
+
+    @classmethod
+    def from_dense(cls, array: ndarray) -> sparse_array2d:
+        """Copy a dense array into chunks, skipping empty ones."""
+        new = cls(array.shape, array.dtype)
+        step = cls.CHUNK_SIZE
+        for x in range(0, array.shape[0], step):
+            band = array[x : x + step]
+            rows = flatnonzero(band.any(axis=0))
+            for cy in sorted(set((rows >> cls.CHUNK_SHIFT).tolist())):
+                part = band[:, cy * step : (cy + 1) * step]
+                chunk = new._new_chunk()
+                chunk[: part.shape[0], : part.shape[1]] = part
+                new.chunks[(x >> cls.CHUNK_SHIFT, cy)] = chunk
+        return new
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self._size
+
+    @size.setter
+    def size(self, size: tuple[int, int]):
+        width, height = size
+        if width < self._size[0] or height < self._size[1]:
+            # Clear cells which leave the logical area
+            for key, chunk in list(self.chunks.items()):
+                self._clip(key, chunk, width, height)
+                if not chunk.any():
+                    del self.chunks[key]
+        self._size = size
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.chunks) * self.CHUNK_SIZE ** 2 * self.dtype.itemsize
+
+    def get(self, x: int, y: int):
+        shift = self.CHUNK_SHIFT
+        chunk = self.chunks.get((x >> shift, y >> shift))
+        if chunk is None:
+            return self.dtype.type(0)
+        return chunk[x & self.CHUNK_MASK, y & self.CHUNK_MASK]
+
+    def set(self, x: int, y: int, value):
+        key = (x >> self.CHUNK_SHIFT, y >> self.CHUNK_SHIFT)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if not value:
+                return
+            chunk = self.chunks[key] = self._new_chunk()
+        chunk[x & self.CHUNK_MASK, y & self.CHUNK_MASK] = value
+        if not value and not chunk.any():
+            del self.chunks[key]
+
+    def fill(self, value):
+        self.chunks.clear()
+        if not value:
+            return
+        width, height = self._size
+        for cx in range(-(-width >> self.CHUNK_SHIFT)):
+            for cy in range(-(-height >> self.CHUNK_SHIFT)):
+                chunk = full((self.CHUNK_SIZE,) * 2, value, self.dtype)
+                self._clip((cx, cy), chunk, width, height)
+                self.chunks[(cx, cy)] = chunk
+
+    def items(self) -> Iterator[tuple[int, int, object]]:
+        """Yield (x, y, value) for every set cell, a chunk at a time."""
+        for (cx, cy), chunk in self.chunks.items():
+            x0, y0 = cx << self.CHUNK_SHIFT, cy << self.CHUNK_SHIFT
+            xs, ys = chunk.nonzero()
+            values = chunk[xs, ys].tolist()
+            for x, y, value in zip(xs.tolist(), ys.tolist(), values):
+                yield (x0 + x, y0 + y, value)
+
+    def minimize(self):
+        """Shrink the size to the last set column and row."""
+        width = height = 1
+        shift = self.CHUNK_SHIFT
+        for (cx, cy), chunk in self.chunks.items():
+            xs, ys = chunk.nonzero()
+            width = max(width, (cx << shift) + int(xs.max()) + 1)
+            height = max(height, (cy << shift) + int(ys.max()) + 1)
+        self.size = (width, height)
+
+    # Region queries
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> ndarray:
+        """Dense copy of the cells in [x0, x1) by [y0, y1)."""
+        out = zeros((max(x1 - x0, 0), max(y1 - y0, 0)), self.dtype)
+        for left, top, chunk, xs, ys in self._overlap(x0, y0, x1, y1):
+            left, top = left - x0, top - y0
+            out[
+                left + xs.start : left + xs.stop,
+                top + ys.start : top + ys.stop,
+            ] = chunk[xs, ys]
+        return out
+
+    def set_region(self, x0: int, y0: int, values: ndarray):
+        """Write a dense array into the cells from (x0, y0)."""
+        x1, y1 = x0 + values.shape[0], y0 + values.shape[1]
+        for left, top, chunk, xs, ys in self._overlap(x0, y0, x1, y1, True):
+            part = values[
+                left + xs.start - x0 : left + xs.stop - x0,
+                top + ys.start - y0 : top + ys.stop - y0,
+            ]
+            key = (left >> self.CHUNK_SHIFT, top >> self.CHUNK_SHIFT)
+            if chunk is None:
+                if not part.any():
+                    continue
+                chunk = self.chunks[key] = self._new_chunk()
+            chunk[xs, ys] = part
+            if not chunk.any():
+                del self.chunks[key]
+
+    def any_in(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Whether any cell in [x0, x1) by [y0, y1) is set."""
+        for _, _, chunk, xs, ys in self._overlap(x0, y0, x1, y1):
+            if chunk[xs, ys].any():
+                return True
+        return False
+
+    def dense(self) -> ndarray:
+        """Dense copy of every cell."""
+        return self.region(0, 0, *self._size)
+
+    # Internal
+    def _new_chunk(self) -> ndarray:
+        return zeros((self.CHUNK_SIZE,) * 2, self.dtype)
+
+    def _clip(self, key: tuple, chunk: ndarray, width: int, height: int):
+        """Clear the cells of a chunk outside of width by height."""
+        chunk[max(width - (key[0] << self.CHUNK_SHIFT), 0) :, :] = 0
+        chunk[:, max(height - (key[1] << self.CHUNK_SHIFT), 0) :] = 0
+
+    def _overlap(
+        self, x0: int, y0: int, x1: int, y1: int, missing: bool = False
+    ) -> Iterator[tuple]:
+        """Yield (left, top, chunk, xs, ys) for the chunks overlapping
+        [x0, x1) by [y0, y1) clipped to the size, with the slices of
+        each chunk inside of it. Missing chunks are None if asked for."""
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self._size[0]), min(y1, self._size[1])
+        if x0 >= x1 or y0 >= y1:
+            return
+        shift, step = self.CHUNK_SHIFT, self.CHUNK_SIZE
+        for cx in range(x0 >> shift, ((x1 - 1) >> shift) + 1):
+            left = cx << shift
+            xs = slice(max(x0 - left, 0), min(x1 - left, step))
+            for cy in range(y0 >> shift, ((y1 - 1) >> shift) + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is not None or missing:
+                    top = cy << shift
+                    ys = slice(max(y0 - top, 0), min(y1 - top, step))
+                    yield left, top, chunk, xs, ys
@@ -0,0 +1,175 @@
+from __future__ import annotations
+from typing import Iterator, Optional, Union
+
+from numpy import asarray, ndarray, uint32
+
+from .array import array2d_view
+from .sparse_array import sparse_array2d
+from .vector import vec2d
+
+
+class tile_array2d:
+    """2D array of (tilemap_id, tile_id) pairs packed into uint32 codes.
+    A code is ((tilemap_id << 16) | tile_id) + 1 so 0 means empty, with
+    tile_id stored as signed 16 bits since levels may index from the end.
+    Codes are kept in sparse_array2d chunks so only painted areas use
+    memory. Has the same interface as array2d with tuples or None as
+    values."""
+
+    TILE_BITS = 16
+    TILE_MASK = (1 << TILE_BITS) - 1
+    TILE_SIGN = 1 << (TILE_BITS - 1)
+    TILEMAP_MAX = TILE_MASK - 1
+
+    EMPTY = None
+
+    def __init__(self, size: tuple[int, int]):
+        self._cells = sparse_array2d(size, uint32)
+
+    def __str__(self):
+        string = []
+        string.append("[")
+        for y in range(self.height):
+            string.append("\t" + str(self.get_row(y)))
+        string.append("]")
+        return "\n".join(string)
+
+    # Encoding
+    @classmethod
+    def encode(cls, tile_info: Optional[tuple[int, int]]) -> int:
+        if tile_info is None:
+            return 0
+        tilemap_id, tile_id = tile_info
+        if (
+            not 0 <= tilemap_id <= cls.TILEMAP_MAX
+            or not -cls.TILE_SIGN <= tile_id < cls.TILE_SIGN
+        ):
+            raise ValueError(f"tile {tile_info} can not be packed")
+        return ((tilemap_id << cls.TILE_BITS) | (tile_id & cls.TILE_MASK)) + 1
+
+    @classmethod
+    def decode(cls, code: int) -> Optional[tuple[int, int]]:
+        if code == 0:
+            return None
+        code -= 1
+        tile_id = code & cls.TILE_MASK
+        if tile_id >= cls.TILE_SIGN:
+            tile_id -= 1 << cls.TILE_BITS
+        return (code >> cls.TILE_BITS, tile_id)
+
+    @classmethod
+    def encode_columns(cls, columns: list[list]) -> ndarray:
+        """Codes of a list of columns of tuples and None."""
+        encode = cls.encode
+        codes = [[encode(cell) for cell in column] for column in columns]
+        return asarray(codes, dtype=uint32)
+
+    @classmethod
+    def decode_columns(cls, codes: ndarray) -> list[list]:
+        """List of columns of tuples and None from codes."""
+        decode = cls.decode
+        return [[decode(code) for code in column] for column in codes.tolist()]
+
+    # Properties
+    @property
+    def array(self) -> list[list]:
+        """Dense list of columns of tuples and None, built on request."""
+        return self.decode_columns(self.codes)
+
+    @array.setter
+    def array(self, array: list[list]):
+        self.codes = self.encode_columns(array)
+
+    @property
+    def codes(self) -> ndarray:
+        """Dense copy of the packed codes indexed as [x, y]."""
+        return self._cells.dense()
+
+    @codes.setter
+    def codes(self, codes: Union[list[list[int]], ndarray]):
+        self._cells = sparse_array2d.from_dense(asarray(codes, dtype=uint32))
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self._cells.size
+
+    @size.setter
+    def size(self, size: tuple[int, int]):
+        self._cells.size = size
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self._cells.nbytes
+
+    def minimize(self):
+        self._cells.minimize()
+
+    def codes_in(self, x: int, y: int, width: int, height: int) -> ndarray:
+        """Copy of the codes in a rectangle, 0 outside of the array."""
+        return self._cells.region(x, y, x + width, y + height)
+
+    def get(self, x: int, y: int) -> Optional[tuple[int, int]]:
+        width, height = self._cells.size
+        if 0 <= x < width and 0 <= y < height:
+            return self.decode(int(self._cells.get(x, y)))
+        raise IndexError(f"no point ({x}, {y})")
+
+    def set(self, x: int, y: int, value: Optional[tuple[int, int]]):
+        code = self.encode(value)
+        if not self._bounded((x, y)):
+            if x < 0 or y < 0:
+                raise IndexError(f"no point ({x}, {y})")
+            if code == 0:
+                return
+            self.size = (max(x + 1, self.size[0]), max(y + 1, self.size[1]))
+        self._cells.set(x, y, code)
+
+    def delete(self, x: int, y: int):
+        if self._bounded((x, y)):
+            self._cells.set(x, y, 0)
+
+    def get_column(self, x: int) -> list:
+        if self._bounded((x, 0)):
+            return self._get_span(x, 0, self.height)
+        raise IndexError(f"no column {x}")
+
+    def get_row(self, y: int) -> list:
+        if self._bounded((0, y)):
+            row = self._cells.region(0, y, self.width, y + 1)[:, 0]
+            return [self.decode(code) for code in row.tolist()]
+        raise IndexError(f"no row {y}")
+
+    def fill(self, value: Optional[tuple[int, int]]):
+        self._cells.fill(self.encode(value))
+
+    def items(self) -> Iterator[tuple[int, int, tuple[int, int]]]:
+        """Yield (x, y, (tilemap_id, tile_id)) for every painted cell."""
+        decode = self.decode
+        for x, y, code in self._cells.items():
+            yield (x, y, decode(code))
+
+    def view(self, x: int, y: int, width: int, height: int) -> array2d_view:
+        """Rectangular window into the array which shares its storage."""
+        return array2d_view(self, x, y, width, height)
+
+    def _get_span(self, x: int, y0: int, y1: int) -> list:
+        codes = self._cells.region(x, y0, x + 1, y1)[0].tolist()
+        return [self.decode(code) for code in codes]
+
+    def _set_span(self, x: int, y0: int, values: list):
+        encode = self.encode
+        codes = [[encode(value) for value in values]]
+        self._cells.set_region(x, y0, asarray(codes, dtype=uint32))
+
+    def _bounded(self, point: Union[vec2d, tuple]):
+        if 0 <= point[0] < self.size[0] and 0 <= point[1] < self.size[1]:
+            return True
+        return False
@@ -14,15 +14,21 @@ class classproperty(property):
 
 
 class vec2d(object):
+    """2D vector with x and y stored directly in slots.
+    Operators check for vec2d and plain numbers first so the common
+    cases never go through parse."""
+
+    __slots__ = ("x", "y")
+
     # Magic methods
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
     def __eq__(self, other) -> bool:
-        if self.x == other.x and self.y == other.y:
-            return True
-        return False
+        if isinstance(other, vec2d):
+            return self.x == other.x and self.y == other.y
+        return NotImplemented
 
     def __len__(self):
         return 2
@@ -41,7 +47,15 @@ class vec2d(object):
     def __str__(self) -> str:
         return f"<{self.x}, {self.y}>"
 
+    def __repr__(self) -> str:
+        return f"vec2d({self.x!r}, {self.y!r})"
+
     def __add__(self, other) -> vec2d:
+        cls = other.__class__
+        if cls is vec2d:
+            return vec2d(self.x + other.x, self.y + other.y)
+        if cls is int or cls is float:
+            return vec2d(self.x + other, self.y + other)
         other = self.parse(other)
         return vec2d(self.x + other.x, self.y + other.y)
 
@@ -49,6 +63,11 @@ class vec2d(object):
         return self.__add__(other)
 
     def __sub__(self, other) -> vec2d:
+        cls = other.__class__
+        if cls is vec2d:
+            return vec2d(self.x - other.x, self.y - other.y)
+        if cls is int or cls is float:
+            return vec2d(self.x - other, self.y - other)
         other = self.parse(other)
         return vec2d(self.x - other.x, self.y - other.y)
 
@@ -56,6 +75,11 @@ class vec2d(object):
         return self.__sub__(other)
 
     def __mul__(self, other) -> vec2d:
+        cls = other.__class__
+        if cls is int or cls is float:
+            return vec2d(self.x * other, self.y * other)
+        if cls is vec2d:
+            return vec2d(self.x * other.x, self.y * other.y)
         other = self.parse(other)
         return vec2d(self.x * other.x, self.y * other.y)
 
@@ -66,6 +90,11 @@ class vec2d(object):
         return self.__mul__(other)
 
     def __truediv__(self, other) -> vec2d:
+        cls = other.__class__
+        if cls is int or cls is float:
+            return vec2d(self.x / other, self.y / other)
+        if cls is vec2d:
+            return vec2d(self.x / other.x, self.y / other.y)
         other = self.parse(other)
         return vec2d(self.x / other.x, self.y / other.y)
 
@@ -73,6 +102,11 @@ class vec2d(object):
         return self.__truediv__(other)
 
     def __floordiv__(self, other) -> vec2d:
+        cls = other.__class__
+        if cls is int or cls is float:
+            return vec2d(self.x // other, self.y // other)
+        if cls is vec2d:
+            return vec2d(self.x // other.x, self.y // other.y)
         other = self.parse(other)
         return vec2d(self.x // other.x, self.y // other.y)
 
@@ -89,25 +123,9 @@ class vec2d(object):
 
     # Consants
     @staticmethod
-    def zero():
-        return vec2d(0, 0)
-
-    # Propertiess
-    @property
-    def x(self):
-        return self._x
-
-    @x.setter
-    def x(self, value):
-        self._x = value
-
-    @property
-    def y(self):
-        return self._y
-
-    @y.setter
-    def y(self, value):
-        self._y = value
+    def zero() -> frozenvec2d:
+        """Shared immutable zero vector."""
+        return ZERO
 
     # Methods
     def grid(self, cell_size) -> vec2d:
@@ -134,5 +152,39 @@ class vec2d(object):
         return self / mag
 
 
+class frozenvec2d(vec2d):
+    """Immutable vec2d which is safe to use as a default argument and is
+    shared by vec2d.zero(). Arithmetic returns regular vec2d objects."""
+
+    __slots__ = ("_hash",)
+
+    def __init__(self, x, y):
+        _set_x(self, x)
+        _set_y(self, y)
+        _set_hash(self, hash((x, y)))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (type(self), (self.x, self.y))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.x!r}, {self.y!r})"
+
+
+_set_x = vec2d.x.__set__
+_set_y = vec2d.y.__set__
+_set_hash = frozenvec2d._hash.__set__
+
+ZERO = frozenvec2d(0, 0)
+
+
 if __name__ == "__main__":
     print(vec2d.zero())
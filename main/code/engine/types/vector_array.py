@@ -0,0 +1,219 @@
+"""Contiguous NumPy storage for many vectors."""
+
+from __future__ import annotations
+from typing import Iterable, Iterator
+
+from numpy import asarray, empty, float64, floor, ndarray
+
+from .vector import vec2d
+
+
+class vec2d_view(vec2d):
+    """vec2d which reads and writes one row of a vec2d_array.
+    Arithmetic returns regular vec2d objects like any other vector."""
+
+    __slots__ = ("_owner", "_index")
+
+    def __init__(self, owner: vec2d_array, index: int):
+        self._owner = owner
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return float(self._owner._array[self._index, 0])
+
+    @x.setter
+    def x(self, value):
+        self._owner._array[self._index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._owner._array[self._index, 1])
+
+    @y.setter
+    def y(self, value):
+        self._owner._array[self._index, 1] = value
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def __repr__(self) -> str:
+        return f"vec2d_view({self.x!r}, {self.y!r})"
+
+
+class vec2d_array:
+    """Growable array of vectors stored as one (n, 2) float array.
+    Arithmetic is applied to every vector at once."""
+
+    def __init__(self, size: int = 0, capacity: int = 16):
+        self._array = empty((max(size, capacity, 1), 2), dtype=float64)
+        self._array[:size] = 0
+        self._length = size
+
+    @classmethod
+    def from_vectors(cls, vectors: Iterable[vec2d]) -> vec2d_array:
+        """Create array from an iterable of vec2d or (x, y) pairs."""
+        data = [(vec[0], vec[1]) for vec in vectors]
+        new = cls(len(data))
+        if data:
+            new._array[: len(data)] = data
+        return new
+
+    @classmethod
+    def _wrap(cls, array: ndarray) -> vec2d_array:
+        new = cls(0, len(array))
+        new._array[: len(array)] = array
+        new._length = len(array)
+        return new
+
+    # Magic methods
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[vec2d_view]:
+        for index in range(self._length):
+            yield vec2d_view(self, index)
+
+    def __getitem__(self, index: int) -> vec2d_view:
+        return vec2d_view(self, self._index(index))
+
+    def __setitem__(self, index: int, vec: vec2d):
+        self._array[self._index(index)] = (vec[0], vec[1])
+
+    def __str__(self) -> str:
+        return f"vec2d_array({self.array.tolist()})"
+
+    # Properties
+    @property
+    def array(self) -> ndarray:
+        """(n, 2) view of the stored vectors."""
+        return self._array[: self._length]
+
+    @property
+    def x(self) -> ndarray:
+        return self._array[: self._length, 0]
+
+    @property
+    def y(self) -> ndarray:
+        return self._array[: self._length, 1]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._array)
+
+    # Storage
+    def append(self, vec: vec2d) -> int:
+        """Add vector and return its index."""
+        if self._length == len(self._array):
+            self._reserve(self._length * 2)
+        index = self._length
+        self._array[index] = (vec[0], vec[1])
+        self._length += 1
+        return index
+
+    def extend(self, vectors: Iterable[vec2d]):
+        """Add many vectors."""
+        data = [(vec[0], vec[1]) for vec in vectors]
+        length = self._length + len(data)
+        if length > len(self._array):
+            self._reserve(max(length, len(self._array) * 2))
+        if data:
+            self._array[self._length : length] = data
+        self._length = length
+
+    def remove(self, index: int) -> int:
+        """Remove vector by moving the last vector into its place.
+        Returns the old index of the moved vector."""
+        index = self._index(index)
+        last = self._length - 1
+        self._array[index] = self._array[last]
+        self._length = last
+        return last
+
+    def clear(self):
+        self._length = 0
+
+    def to_vectors(self) -> list[vec2d]:
+        """Copy out to a list of independent vec2d."""
+        return [vec2d(x, y) for x, y in self.array.tolist()]
+
+    # Vectorised arithmetic
+    def __add__(self, other) -> vec2d_array:
+        return self._wrap(self.array + self._parse(other))
+
+    def __iadd__(self, other) -> vec2d_array:
+        self.array.__iadd__(self._parse(other))
+        return self
+
+    def __sub__(self, other) -> vec2d_array:
+        return self._wrap(self.array - self._parse(other))
+
+    def __isub__(self, other) -> vec2d_array:
+        self.array.__isub__(self._parse(other))
+        return self
+
+    def __mul__(self, other) -> vec2d_array:
+        return self._wrap(self.array * self._parse(other))
+
+    def __imul__(self, other) -> vec2d_array:
+        self.array.__imul__(self._parse(other))
+        return self
+
+    def __rmul__(self, other) -> vec2d_array:
+        return self.__mul__(other)
+
+    def __truediv__(self, other) -> vec2d_array:
+        return self._wrap(self.array / self._parse(other))
+
+    def __itruediv__(self, other) -> vec2d_array:
+        self.array.__itruediv__(self._parse(other))
+        return self
+
+    def __floordiv__(self, other) -> vec2d_array:
+        return self._wrap(self.array // self._parse(other))
+
+    def __ifloordiv__(self, other) -> vec2d_array:
+        self.array.__ifloordiv__(self._parse(other))
+        return self
+
+    def add_scaled(self, other: vec2d_array, scale: float = 1.0):
+        """In place self += other * scale, e.g. positions += speeds * dt."""
+        self.array.__iadd__(self._parse(other) * scale)
+
+    def floor(self) -> vec2d_array:
+        return self._wrap(floor(self.array))
+
+    def grid(self, cell_size) -> vec2d_array:
+        return self._wrap((self.array // cell_size) * cell_size)
+
+    def cells(self, cell_size: int) -> ndarray:
+        """Integer (n, 2) array of the grid cells each vector is in."""
+        return (self.array // cell_size).astype(int)
+
+    # Internal
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += self._length
+        if 0 <= index < self._length:
+            return index
+        raise IndexError(f"no vector {index}")
+
+    def _reserve(self, capacity: int):
+        new = empty((max(capacity, 1), 2), dtype=float64)
+        new[: self._length] = self._array[: self._length]
+        self._array = new
+
+    def _parse(self, other):
+        if isinstance(other, vec2d_array):
+            if len(other) != self._length:
+                msg = f"length mismatch: {self._length} != {len(other)}"
+                raise ValueError(msg)
+            return other.array
+        elif isinstance(other, vec2d):
+            return asarray((other.x, other.y), dtype=float64)
+        elif isinstance(other, (int, float, ndarray)):
+            return other
+        else:
+            msg = f"type: {type(other)} not supported by vec2d_array"
+            raise TypeError(msg)
@@ -8,7 +8,7 @@ from numpy import sign
 from pygame import Surface, image
 
 from main.code.constants import FULLTILE
-from main.code.engine.components.maths import f_loop
+from main.code.engine.components.maths import f_cell, f_loop
 from main.code.engine.components.object_handler import TileLayer
 from main.code.engine.components.output_handler import Draw
 from main.code.engine.constants import colorize, cprint
@@ -153,7 +153,8 @@ class ObjCursor(Entity):
             # Change modes
             if self.kkey["modeup"] or self.kkey["modedown"]:
                 self.mode += self.kkey["modeup"] - self.kkey["modedown"]
-                self.pos = self.pos.grid(FULLTILE)
+                x, y = f_cell(self.pos, FULLTILE)
+                self.pos = vec2d(x * FULLTILE, y * FULLTILE)
             self.mode = f_loop(self.mode, 0, 2)
 
             # Minimize grid
@@ -241,6 +242,12 @@ class ObjCursor(Entity):
             element = self.engine.debug.menu.get("mode")
             element.text = "Wall mode"
 
+    def _get_mouse_grid(self, cell_size: int) -> vec2d:
+        """World position of the grid cell under the mouse."""
+        pos = self.engine.input.ms.get_pos() + self.engine.cam.pos
+        x, y = f_cell(pos, cell_size)
+        return vec2d(x * cell_size, y * cell_size)
+
     def _get_inputs(self):
         """Register inputs and change variables."""
         for key in self.kkey:
@@ -289,16 +296,14 @@ class ObjCursor(Entity):
 
         # Place object
         if self.mkey["Hplace"] and self.kkey["Hcontrol"]:
-            pos = self.engine.input.ms.get_pos() + self.engine.cam.pos
-            pos = pos.grid(FULLTILE)
+            pos = self._get_mouse_grid(FULLTILE)
             if pos != self.pos or self.mkey["place"]:
                 self.pos = pos
                 self._place_object()
 
         # Select and move object
         elif self.mkey["Hplace"]:
-            pos = self.engine.input.ms.get_pos() + self.engine.cam.pos
-            pos = pos.grid(FULLTILE)
+            pos = self._get_mouse_grid(FULLTILE)
             if pos != self.pos or self.mkey["place"]:
                 self.pos = pos
                 obj = self.selected_object
@@ -310,8 +315,7 @@ class ObjCursor(Entity):
 
         # Remove object
         elif self.mkey["Hremove"] and self.kkey["Hcontrol"]:
-            pos = self.engine.input.ms.get_pos() + self.engine.cam.pos
-            pos = pos.grid(FULLTILE)
+            pos = self._get_mouse_grid(FULLTILE)
             if pos != self.pos or self.mkey["remove"]:
                 self.pos = pos
                 self._remove_object()
@@ -321,7 +325,11 @@ class ObjCursor(Entity):
         self._remove_object()
         name = self.object_names[self.obj_select]
         kwargs = {"name": name, "key": None, "pos": self.pos, "data": {}}
-        self.engine.objects.create_object(self.engine, **kwargs)
+        obj = self.engine.objects.create_object(self.engine, **kwargs)
+        try:
+            obj.create()
+        except AttributeError:
+            pass
 
     def _remove_object(self):
         """Removes object under cursor."""
@@ -443,8 +451,7 @@ class ObjCursor(Entity):
         # Mouse
         if self.mkey["Hplace"] or self.mkey["Hremove"]:
             # Update position
-            pos = self.engine.input.ms.get_pos() + self.engine.cam.pos
-            pos = pos.grid(FULLTILE // 2)
+            pos = self._get_mouse_grid(FULLTILE // 2)
 
             # Place tile
             if self.mkey["Hplace"] and self.kkey["Hcontrol"]:
@@ -468,21 +475,16 @@ class ObjCursor(Entity):
                 new = None
             else:
                 new = (self.tilemap_select, self.tile_select)
+            x, y = f_cell(self.pos, FULLTILE // 2)
             try:
-                old = layer.array.get(*(self.pos // (FULLTILE // 2)).ftup())
+                old = layer.array.get(x, y)
             except IndexError:
                 print("Fill point outside of domain")
                 return
             if new != old:
                 try:
                     print("Recursive fill start")
-                    self._fill(
-                        layer,
-                        *(self.pos // (FULLTILE // 2)).ftup(),
-                        old,
-                        new,
-                        0,
-                    )
+                    self._fill(layer, x, y, old, new, 0)
                     layer.cache()
                 except RecursionError:
                     print("Exceeded recursion depth")
@@ -541,16 +543,14 @@ class ObjCursor(Entity):
 
         # Place wall
         if self.mkey["Hplace"]:
-            pos = self.engine.input.ms.get_pos() + self.engine.cam.pos
-            pos = pos.grid(FULLTILE)
+            pos = self._get_mouse_grid(FULLTILE)
             if pos != self.pos or self.mkey["place"]:
                 self.pos = pos
                 collider.add(pos)
 
         # Remove wall
         elif self.mkey["Hremove"]:
-            pos = self.engine.input.ms.get_pos() + self.engine.cam.pos
-            pos = pos.grid(FULLTILE)
+            pos = self._get_mouse_grid(FULLTILE)
             if pos != self.pos or self.mkey["remove"]:
                 self.pos = pos
                 collider.remove(pos)
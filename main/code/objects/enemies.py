@@ -1,7 +1,7 @@
 from math import floor
 
 
-from ..engine.types import vec2d
+from ..engine.types import frozenvec2d, vec2d
 from ..engine.engine import Engine
 from .game_objects import GameObject, Damageable, ObjPlayer
 
@@ -14,8 +14,8 @@ class Enemy(GameObject, Damageable):
         name: str,
         data: dict,
         pos: vec2d,
-        size: vec2d = vec2d(32, 32),
-        origin: vec2d = vec2d(0, 0),
+        size: vec2d = frozenvec2d(32, 32),
+        origin: vec2d = vec2d.zero(),
     ):
         super().__init__(engine, key, name, data, pos, size, origin)
         self.hp: int = 1
@@ -37,6 +37,9 @@ class Enemy(GameObject, Damageable):
 
 
 class ObjWalkingEnemy(Enemy):
+    SPRITES = ("walking-enemy.png",)
+    SFX = ("beep.ogg",)
+
     def __init__(
         self, engine: Engine, key: int, name: str, data: dict, pos: vec2d
     ):
@@ -47,7 +50,7 @@ class ObjWalkingEnemy(Enemy):
         self.engine.objects.col.dy.add(self.key, self)
 
         # Sprite
-        self.set_frames("walking-enemy.png")
+        self.set_frames(*self.SPRITES)
 
         # Health
         self.hp = 6
@@ -3,9 +3,6 @@
 from random import random
 from time import sleep
 
-from pygame.event import Event, post
-
-
 from main.code.constants import SIZE
 from main.code.engine.components.output_handler import Draw
 from main.code.engine.components.maths import f_limit
@@ -18,7 +15,7 @@ from main.code.engine.components.menu import (
     MenuSlider,
     MenuText,
 )
-from main.code.engine.constants import LEVEL_LOAD, colorize
+from main.code.engine.constants import colorize
 from main.code.engine.engine import Engine
 from main.code.engine.types.entity import Entity
 from main.code.engine.types import vec2d
@@ -27,16 +24,26 @@ from main.code.engine.types import vec2d
 class ObjJukeBox(Entity):
     """Responsible for sick beats."""
 
+    PERSISTENT = True
+
+    @classmethod
+    def add_assets(cls, manifest, data: dict):
+        if data["name"] is not None:
+            manifest.music.add(data["name"])
+
     def __init__(self, engine: Engine, key: int, name: str, data: dict):
         super().__init__(engine, key, name, data)
 
         # Music vars
-        music = engine.output.audio.music
-        current_music = music.get_current()
         self.music = self.data["name"]
         self.loops = self.data["loops"]
         self.volume = self.data["volume"]
 
+    def create(self):
+        """Switch music once the level is live rather than while it is
+        being built behind the old one."""
+        music = self.engine.output.audio.music
+        current_music = music.get_current()
         if self.music is None:
             if current_music is not None:
                 # Fade music
@@ -67,6 +74,9 @@ class ObjJukeBox(Entity):
 
 
 class ObjMainMenu(Entity):
+    SFX = ("beep.ogg",)
+    PERSISTENT = True
+
     def __init__(self, engine: Engine, key: int, name: str, data: dict):
         super().__init__(engine, key, name, data)
 
@@ -193,7 +203,7 @@ class ObjMainMenu(Entity):
         if element.name == "start-button-button":
             self._beep()
             self._rsleep(0.4)
-            post(Event(LEVEL_LOAD, {"level": "level1"}))
+            self.engine.transitions.load("level1")
         elif element.name == "option-button-button":
             self._beep()
             self.title_menu.visible = False
@@ -240,6 +250,8 @@ class ObjMainMenu(Entity):
 
 
 class ObjPauseMenu(Entity):
+    SFX = ("beep.ogg",)
+
     def __init__(self, engine: Engine, key: int, name: str, data: dict):
         engine.objects.ent.add(self, key)
         super().__init__(engine, key, name, data)
@@ -322,12 +334,12 @@ class ObjPauseMenu(Entity):
             self.engine.pause()
         elif element.name == "reset-button":
             self._beep()
-            self.engine.objects.level.reset()
+            self.engine.transitions.reset()
             self.menu.visible = False
             self.engine.pause()
         elif element.name == "quit-button":
             self._beep()
-            post(Event(LEVEL_LOAD, {"level": "mainmenu"}))
+            self.engine.transitions.load("mainmenu")
             self.menu.visible = False
             self.engine.pause()
 
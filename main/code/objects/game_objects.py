@@ -3,33 +3,20 @@
 from os import path
 
 from numpy import sign
-from pygame import image
-from pygame.event import Event, post
 from pygame.surface import Surface
 
 from main.code.constants import FULLTILE
 from main.code.engine.components.maths import f_loop
 from main.code.engine.components.output_handler import Draw
-from main.code.engine.constants import (
-    LEVEL_LOAD,
-    LEVEL_RESET,
-    colorize,
-    cprint,
-)
+from main.code.engine.constants import colorize, cprint
 from main.code.engine.engine import Engine
-from main.code.engine.types import vec2d
+from main.code.engine.types import AABB, frozenvec2d, vec2d
 from main.code.objects.entities import Entity, ObjPauseMenu
 
 
 def rect_overlap(pos: vec2d, size: vec2d, opos: vec2d, osize: vec2d) -> bool:
-    if (
-        pos.x < opos.x + osize.x
-        and pos.x + size.x > opos.x
-        and pos.y < opos.y + osize.y
-        and pos.y + size.y > opos.y
-    ):
-        return True
-    return False
+    box = AABB(pos.x, pos.y, size.x, size.y)
+    return box.overlap_rect(opos.x, opos.y, osize.x, osize.y)
 
 
 # Game objects
@@ -43,8 +30,8 @@ class GameObject(Entity):
         name: str,
         data: dict,
         pos: vec2d,
-        size: vec2d = vec2d(32, 32),
-        offset: vec2d = vec2d(0, 0),
+        size: vec2d = frozenvec2d(32, 32),
+        offset: vec2d = vec2d.zero(),
     ):
         super().__init__(engine, key, name, data)
         self.engine = engine
@@ -89,10 +76,7 @@ class GameObject(Entity):
         for file in fnames:
             file_path = path.join(sprite_path, file)
             try:
-                if alpha:
-                    self.frames.append(image.load(file_path).convert_alpha())
-                else:
-                    self.frames.append(image.load(file_path).convert())
+                self.frames += self.engine.assets.sprites.get(alpha, file)
 
             except FileNotFoundError as error:
                 msg = (
@@ -130,7 +114,8 @@ class GameObject(Entity):
         if pos is None:
             pos = self.pos
         size = self.size
-        pos += self.origin
+        origin = self.origin
+        box = AABB(pos.x + origin.x, pos.y + origin.y, size.x, size.y)
 
         # Get colliders
         colliders = self.engine.objects.col.dy.get_colliders()
@@ -141,11 +126,17 @@ class GameObject(Entity):
             if cobj.key != key:
                 if issubclass(cobj.__class__, GameObject):
                     # Get other's pos and size
-                    opos = cobj.pos + cobj.origin
+                    opos = cobj.pos
+                    oorigin = cobj.origin
                     osize = cobj.size
 
                     # Check for overlap
-                    if rect_overlap(pos, size, opos, osize):
+                    if box.overlap_rect(
+                        opos.x + oorigin.x,
+                        opos.y + oorigin.y,
+                        osize.x,
+                        osize.y,
+                    ):
                         collide.append(cobj)
 
         return collide
@@ -170,7 +161,7 @@ class Collider:
         engine: Engine,
         pos: vec2d,
         size: vec2d,
-        offset: vec2d = vec2d(0, 0),
+        offset: vec2d = vec2d.zero(),
     ):
         self.engine = engine
         self.pos = pos
@@ -189,10 +180,9 @@ class Collider:
     def scollide(self, pos: vec2d = None) -> bool:
         if pos is None:
             pos = self.pos
-        for point in self.cpoints:
-            if self.engine.objects.col.st.get(pos + point):
-                return True
-        return False
+        offset = self.offset
+        corner = vec2d(pos.x + offset.x, pos.y + offset.y)
+        return self.engine.objects.col.st.get_rect(corner, self.size)
 
 
 class Damageable:
@@ -211,6 +201,10 @@ class Damageable:
 class ObjPlayer(GameObject, Damageable):
     """Player game object."""
 
+    SPRITES = ("player.png",)
+    SFX = ("boop.wav",)
+    PERSISTENT = True
+
     def __init__(
         self, engine: Engine, key: int, name: str, data: dict, pos: vec2d
     ):
@@ -271,7 +265,7 @@ class ObjPlayer(GameObject, Damageable):
         self.camspeed = 0.25
 
         # Sprite
-        self.set_frames("player.png")
+        self.set_frames(*self.SPRITES)
         self.trail: list[vec2d] = []
 
         # Health
@@ -284,11 +278,20 @@ class ObjPlayer(GameObject, Damageable):
         # Audio
         engine.output.audio.sfx.add("boop.wav")
 
-        # Pause menu
+        # Pause menu, registered by create
         self.pause_menu = ObjPauseMenu(self.engine, 0, "", {})
-        self.engine.objects.ent.sobj["pause-menu"] = self.pause_menu
         self.pause_menu.menu.visible = False
 
+    def create(self):
+        """Register the pause menu once the level is live, sobj is
+        shared with the level being replaced while this one is built."""
+        self.engine.objects.ent.sobj["pause-menu"] = self.pause_menu
+
+    @classmethod
+    def add_assets(cls, manifest, data: dict):
+        super().add_assets(manifest, data)
+        ObjPauseMenu.add_assets(manifest, {})
+
     @property
     def hp(self):
         return self._hp
@@ -316,7 +319,7 @@ class ObjPlayer(GameObject, Damageable):
             if self.mode == 0:
                 # Reset room
                 if self.kkey["reset"] == 1:
-                    post(Event(LEVEL_RESET))
+                    self.engine.transitions.reset()
 
                 # Dynamic collision
                 self._dcol()
@@ -367,7 +370,7 @@ class ObjPlayer(GameObject, Damageable):
             self.vspd += self.jump_speed
 
     def _die(self):
-        post(Event(LEVEL_RESET))
+        self.engine.transitions.reset()
         self.engine.output.audio.sfx.play("boop.wav")
 
     def _get_inputs(self):
@@ -513,12 +516,19 @@ class ObjPlayer(GameObject, Damageable):
 
     def delete(self):
         super().delete()
-        del self.engine.objects.ent.sobj["pause-menu"]
+        sobj = self.engine.objects.ent.sobj
+        if sobj.get("pause-menu") is self.pause_menu:
+            del sobj["pause-menu"]
 
 
 class ObjButton(GameObject):
     """Button game object."""
 
+    SPRITES = ("button0.png", "button1.png")
+    ALPHA = True
+    # Kept loaded in streamed levels so its door can always be opened
+    PERSISTENT = True
+
     def __init__(
         self, engine: Engine, key: int, name: str, data: dict, pos: vec2d
     ):
@@ -537,15 +547,15 @@ class ObjButton(GameObject):
             self.door_id = self.data["door"]
         except KeyError:
             cprint("Door object not set for button!", "red")
-        self.set_frames("button0.png", "button1.png", alpha=True)
+        self.set_frames(*self.SPRITES, alpha=self.ALPHA)
 
     def collide(self, obj: GameObject):
         """When collided with by player, open the door."""
         if isinstance(obj, ObjPlayer):
             if self.frame == 0:
                 try:
-                    self.engine.objects.ent.obj[self.door_id].frame = 1
-                except AttributeError:
+                    self.engine.objects.ent.obj[self.door_id].open()
+                except (AttributeError, KeyError):
                     cprint("Unable to find door!", "red")
                 self.frame = 1
 
@@ -553,6 +563,10 @@ class ObjButton(GameObject):
 class ObjDoor(GameObject):
     """Door game object."""
 
+    SPRITES = ("door0.png", "door1.png")
+    # Kept loaded in streamed levels so it stays open once opened
+    PERSISTENT = True
+
     def __init__(
         self, engine: Engine, key: int, name: str, data: dict, pos: vec2d
     ):
@@ -565,13 +579,21 @@ class ObjDoor(GameObject):
             cprint("Door has no next level set!", "red")
 
         # Images
-        self.set_frames("door0.png", "door1.png")
+        self.set_frames(*self.SPRITES)
+
+    def open(self):
+        """Open door and start reading the next level in the background."""
+        self.frame = 1
+        try:
+            self.engine.objects.level.preload(self.next_level)
+        except AttributeError:
+            pass
 
     def collide(self, obj: GameObject):
         if isinstance(obj, ObjPlayer):
             if self.frame == 1:
                 try:
-                    post(Event(LEVEL_LOAD, {"level": self.next_level}))
+                    self.engine.transitions.load(self.next_level)
                 except AttributeError:
                     cprint("Unable to load level!", "red")
 
@@ -579,6 +601,9 @@ class ObjDoor(GameObject):
 class ObjGravOrb(GameObject):
     """GravOrb game object."""
 
+    SPRITES = ("grav-orb0.png", "grav-orb1.png", "grav-orb2.png")
+    ALPHA = True
+
     def __init__(
         self, engine: Engine, key: int, name: str, data: dict, pos: vec2d
     ):
@@ -588,12 +613,19 @@ class ObjGravOrb(GameObject):
         self.grav = self.data["grav"]
 
         # Images
-        if self.grav > 0:
-            self.set_frames("grav-orb0.png", alpha=True)
-        elif self.grav == 0:
-            self.set_frames("grav-orb1.png", alpha=True)
-        elif self.grav < 1:
-            self.set_frames("grav-orb2.png", alpha=True)
+        self.set_frames(self.sprite(self.grav), alpha=self.ALPHA)
+
+    @classmethod
+    def sprite(cls, grav: float) -> str:
+        if grav > 0:
+            return cls.SPRITES[0]
+        elif grav == 0:
+            return cls.SPRITES[1]
+        return cls.SPRITES[2]
+
+    @classmethod
+    def add_assets(cls, manifest, data: dict):
+        manifest.sprites.add((cls.sprite(data["grav"]), cls.ALPHA))
 
     def collide(self, obj: GameObject):
         if isinstance(obj, ObjPlayer):
@@ -624,6 +656,9 @@ class ObjGravOrb(GameObject):
 class ObjSpike(GameObject):
     """Spike game object."""
 
+    SPRITES = ("spike.png",)
+    ALPHA = True
+
     def __init__(
         self, engine: Engine, key: int, name: str, data: dict, pos: vec2d
     ):
@@ -641,7 +676,7 @@ class ObjSpike(GameObject):
         self.damage = 5
 
         # Images
-        self.set_frames("spike.png", alpha=True)
+        self.set_frames(*self.SPRITES, alpha=self.ALPHA)
 
     def collide(self, obj: ObjPlayer):
         if isinstance(obj, ObjPlayer):
@@ -652,6 +687,9 @@ class ObjSpike(GameObject):
 class ObjSpikeInv(GameObject):
     """Spike game object, but upside down."""
 
+    SPRITES = ("spike-inv.png",)
+    ALPHA = True
+
     def __init__(
         self, engine: Engine, key: int, name: str, data: dict, pos: vec2d
     ):
@@ -661,7 +699,7 @@ class ObjSpikeInv(GameObject):
         self.damage = 5
 
         # Images
-        self.set_frames("spike-inv.png", alpha=True)
+        self.set_frames(*self.SPRITES, alpha=self.ALPHA)
 
     def collide(self, obj: GameObject):
         if isinstance(obj, ObjPlayer):
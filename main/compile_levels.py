@@ -0,0 +1,94 @@
+"""Game-X offline level compiler.
+
+usage: python -m main.compile_levels [--jobs N] [level ...]
+Compiles every level in assets/levels when no level names are given,
+one level per process. Each level is checked for tiles missing from
+assets/tilemaps and doors leading to missing levels, then written to
+assets/levels/compiled as a .gxl with a pre-rendered image per layer.
+The game loads the compiled level while it is newer than the JSON, so
+levels have to be compiled again after a tilemap changes.
+--jobs        number of processes, one per CPU if not given
+--help        shows this message"""
+printer = ["\033[36m# Game-X compile_levels.py"]
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from os import environ, getcwd, listdir, path
+
+# Add main_path if not in sys.path
+root = getcwd()
+if root not in sys.path:
+    printer.append(f"adding path: {root}")
+    sys.path.insert(0, root)
+environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+from main.code.constants import FULLTILE
+from main.code.engine.components.level_compiler import compile_level
+from main.code.engine.constants import cprint
+
+
+def main(args: list[str]) -> int:
+    for line in printer:
+        print(line)
+    print("\033[0m")
+
+    # Options
+    jobs = None
+    names = []
+    args = iter(args)
+    for arg in args:
+        if arg in ("-h", "--help"):
+            print(__doc__)
+            return 0
+        elif arg == "--jobs":
+            value = next(args, "")
+            if not value.isdigit() or int(value) < 1:
+                cprint(f"--jobs needs a process count, got {value!r}", "red")
+                print(__doc__)
+                return 1
+            jobs = int(value)
+        elif arg.startswith("-"):
+            cprint(f"unknown option: {arg}", "red")
+            print(__doc__)
+            return 1
+        else:
+            names.append(arg)
+
+    levels = path.join(root, "assets", "levels")
+    tilemaps = path.join(root, "assets", "tilemaps")
+
+    # Default to every level
+    if not names:
+        names = [
+            path.splitext(fname)[0]
+            for fname in sorted(listdir(levels))
+            if fname.endswith(".json")
+        ]
+
+    failed = 0
+    halftile = FULLTILE // 2
+    with ProcessPoolExecutor(jobs) as executor:
+        futures = [
+            executor.submit(compile_level, levels, tilemaps, name, halftile)
+            for name in names
+        ]
+        for name, future in zip(names, futures):
+            try:
+                _, errors, written = future.result()
+            except Exception as error:
+                errors, written = [str(error)], []
+            if errors:
+                failed += 1
+                cprint(f"{name}: failed", "red")
+                for error in errors:
+                    cprint(f"    {error}", "red")
+            else:
+                size = sum(path.getsize(fname) for fname in written)
+                print(f"{name}: {len(written)} files, {size} bytes")
+
+    print(f"compiled {len(names) - failed} of {len(names)} levels")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
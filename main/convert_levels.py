@@ -0,0 +1,74 @@
+"""Game-X level converter between JSON and binary .gxl levels.
+
+usage: python -m main.convert_levels [--to-json | --compact] [level ...]
+Converts every level in assets/levels when no level names are given.
+--to-json     converts .gxl levels back to JSON
+--compact     rewrites JSON levels in place, run length encoding grids
+              wherever that is smaller
+--help        shows this message"""
+printer = ["\033[36m# Game-X convert_levels.py"]
+
+import sys
+from os import getcwd, listdir, path
+
+# Add main_path if not in sys.path
+root = getcwd()
+if root not in sys.path:
+    printer.append(f"adding path: {root}")
+    sys.path.insert(0, root)
+
+from main.code.engine.components import level_format
+from main.code.engine.constants import cprint
+
+
+OPTIONS = {"--to-json", "--compact"}
+
+
+def main(args: list[str]) -> int:
+    for line in printer:
+        print(line)
+    print("\033[0m")
+
+    # Options
+    options = {arg for arg in args if arg.startswith("-")}
+    if options & {"-h", "--help"}:
+        print(__doc__)
+        return 0
+    if options - OPTIONS:
+        unknown = ", ".join(sorted(options - OPTIONS))
+        cprint(f"unknown option: {unknown}", "red")
+        print(__doc__)
+        return 1
+
+    names = [arg for arg in args if not arg.startswith("-")]
+    levels = path.join(root, "assets", "levels")
+    if "--compact" in args:
+        source_ext, dest_ext = (".json", ".json")
+    elif "--to-json" in args:
+        source_ext, dest_ext = (".gxl", ".json")
+    else:
+        source_ext, dest_ext = (".json", ".gxl")
+
+    # Default to every level
+    if not names:
+        names = [
+            path.splitext(fname)[0]
+            for fname in sorted(listdir(levels))
+            if fname.endswith(source_ext)
+        ]
+
+    for name in names:
+        source = path.join(levels, name + source_ext)
+        destination = path.join(levels, name + dest_ext)
+        if not path.exists(source):
+            cprint(f"level not found: {source}", "red")
+            continue
+        before = path.getsize(source)
+        level_format.convert(source, destination)
+        after = path.getsize(destination)
+        print(f"{name}: {before} -> {after} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
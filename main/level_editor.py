@@ -42,7 +42,8 @@ def create_objects(engine: Engine, **kwargs):
     name: name of the object being created.
     key: id of the key when created
     pos: position of the created object.
-    data: dictionary containing kwargs for __init__."""
+    data: dictionary containing kwargs for __init__.
+    Returns the created object."""
     name = kwargs["name"]
     key = kwargs["key"]
     key = engine.objects.ent._check_key(key)
@@ -50,6 +51,7 @@ def create_objects(engine: Engine, **kwargs):
     data = kwargs["data"]
     obj = Object(engine, name, key, pos, data)
     engine.objects.ent.add(obj, key)
+    return obj
 
 
 # Special
@@ -86,14 +88,17 @@ class Game(Application):
         if self.debug:
             self.debug.menu.remove("rect")
             ele = MenuText(self, self.debug.menu, "curpos")
-            ele.pos = vec2d(0, 12 * 3)
-            ele = MenuText(self, self.debug.menu, "mode")
             ele.pos = vec2d(0, 12 * 4)
+            ele = MenuText(self, self.debug.menu, "mode")
+            ele.pos = vec2d(0, 12 * 5)
 
         # Create cursor and camera
         ObjCursor(self, vec2d(0, 0))
         self.cam = View(self, SIZE)
 
+        # Levels are edited whole, never streamed
+        self.objects.level.stream_cells = None
+
         # Add stcol to sobj
         self.objects.ent.sobj["stcol"] = self.objects.col.st
 
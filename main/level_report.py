@@ -0,0 +1,177 @@
+"""Game-X level capacity report.
+
+usage: python -m main.level_report [--json FILE] [--calibrate]
+                                   [--root DIR] [level ...]
+Reports every level in assets/levels when no level names are given:
+grid size, tiles per layer, objects by class, layer surface memory and
+the load time predicted by a model of how long loads take.
+--json        also write the full report to FILE as JSON
+--calibrate   load each level in the game first, fit the load model to
+              the timings and save it to settings/load_model.json
+--root        game directory holding assets, the working directory if
+              not given"""
+printer = ["\033[36m# Game-X level_report.py"]
+
+import json
+import sys
+from math import ceil
+from os import environ, getcwd, listdir, path
+
+# Add main_path if not in sys.path
+root = getcwd()
+if root not in sys.path:
+    printer.append(f"adding path: {root}")
+    sys.path.insert(0, root)
+environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+from main.code.constants import FPS, FULLTILE, SIZE
+from main.code.engine.components import level_format
+from main.code.engine.components.level_report import LoadModel, report_level
+from main.code.engine.constants import cprint
+from main.main_application import class_name
+
+MEMORY_BUDGET = 256 * 2 ** 20  # bytes of layer surfaces per level
+LOAD_BUDGET = 0.5 / FPS  # seconds of loading per frame, see Application
+
+
+def calibrate(game_root: str, names: list[str]) -> LoadModel:
+    """Load every level in the game and fit a model to the timings."""
+    environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from main.main_application import Game
+
+    game = Game(FULLTILE, FPS, SIZE, game_root)
+    samples = []
+    for name in names:
+        # Best of three uncached loads
+        best = None
+        for _ in range(3):
+            game.objects.level.cache.clear()
+            game.objects.level.load(name)
+            profile = game.objects.level.profile
+            if best is None or profile.total < best.total:
+                best = profile
+        report = report_level(
+            level_file(game_root, name), FULLTILE, SIZE.ftup(), class_name
+        )
+        samples.append((report, best))
+    game.end()
+    return LoadModel.fit(samples)
+
+
+def level_file(game_root: str, name: str) -> str:
+    """File the game would load for a level."""
+    levels = path.join(game_root, "assets", "levels")
+    return level_format.newest_level(path.join(levels, name + ".json"))
+
+
+def main(args: list[str]) -> int:
+    for line in printer:
+        print(line)
+    print("\033[0m")
+
+    # Arguments
+    game_root = root
+    json_file = None
+    calibrating = False
+    names = []
+    args = iter(args)
+    for arg in args:
+        if arg == "--json":
+            json_file = next(args)
+        elif arg == "--root":
+            game_root = next(args)
+        elif arg == "--calibrate":
+            calibrating = True
+        else:
+            names.append(arg)
+    levels = path.join(game_root, "assets", "levels")
+    model_file = path.join(game_root, "settings", "load_model.json")
+
+    # Default to every level
+    if not names:
+        names = [
+            path.splitext(fname)[0]
+            for fname in sorted(listdir(levels))
+            if fname.endswith(".json")
+        ]
+
+    # Load model
+    if calibrating:
+        model = calibrate(game_root, names)
+        model.write(model_file)
+        print(f"load model saved to {model_file}")
+    else:
+        model = LoadModel.read(model_file)
+
+    # Report
+    reports = [
+        report_level(
+            level_file(game_root, name),
+            FULLTILE,
+            SIZE.ftup(),
+            class_name,
+            model,
+        )
+        for name in names
+    ]
+    print_table(reports)
+    if json_file is not None:
+        with open(json_file, "w") as file:
+            json.dump({"model": model.coefficients, "levels": reports}, file)
+        print(f"report written to {json_file}")
+
+    over = [
+        report["level"]
+        for report in reports
+        if report["surface_bytes"] > MEMORY_BUDGET
+    ]
+    for name in over:
+        cprint(f"{name}: layer surfaces over {MEMORY_BUDGET} bytes", "red")
+    return 1 if over else 0
+
+
+def print_table(reports: list[dict]):
+    header = "".join(
+        (
+            f"{'level':<12}",
+            f"{'grid':>11}",
+            f"{'layers':>7}",
+            f"{'tiles':>8}",
+            f"{'objects':>8}",
+            f"{'surf MiB':>9}",
+            f"{'grid KiB':>9}",
+            f"{'load ms':>8}",
+            f"{'frames':>7}",
+            f"{'stream':>7}",
+        )
+    )
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        grid = "x".join(str(size) for size in report["size"])
+        frames = ceil(report["load_ms"] / 1000 / LOAD_BUDGET)
+        print(
+            f"{report['level']:<12}{grid:>11}{len(report['layers']):>7}"
+            f"{report['tiles']:>8}{report['object_count']:>8}"
+            f"{report['surface_bytes'] / 2 ** 20:>9.1f}"
+            f"{report['grid_bytes'] / 2 ** 10:>9.1f}"
+            f"{report['load_ms']:>8.1f}{frames:>7}"
+            f"{str(report['streamed']):>7}"
+        )
+
+    # Breakdowns
+    for report in reports:
+        print(f"\n{report['level']}:")
+        for layer in report["layers"]:
+            size = "x".join(str(size) for size in layer["size"])
+            print(
+                f"    layer {layer['name']}: {size}, "
+                f"{layer['tiles']} of {layer['cells']} cells"
+            )
+        for name, count in report["objects"].items():
+            print(f"    {name}: {count}")
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,6 +3,7 @@ printer = ["\033[36m# Game-X main_application.py"]
 
 import sys
 from os import getcwd, path
+from typing import Optional
 
 # Add root of executable
 if getattr(sys, "frozen", False):
@@ -35,28 +36,34 @@ except ModuleNotFoundError as error:
     raise error
 
 # Object creation function
-def create_objects(engine: Engine, **kwargs):
-    """Takes in a set of keywords and uses them to make an object."""
-    # Setup
-    cname: str = kwargs["name"]
+def class_name(name: str) -> str:
+    """Class name of the objects called name in levels."""
+    parts = name.split("-")
+    return "Obj" + "".join(x.title() for x in parts)
 
-    # Classify the name
-    parts = cname.split("-")
-    cname = "Obj" + "".join(x.title() for x in parts)
-    try:
-        obj_class = getattr(game_objects, cname)
-    except AttributeError:
+
+def get_object_class(name: str) -> Optional[type]:
+    """Class of the objects called name in levels, None if not found."""
+    cname = class_name(name)
+    for module in (game_objects, entities, enemies):
         try:
-            obj_class = getattr(entities, cname)
+            return getattr(module, cname)
         except AttributeError:
-            try:
-                obj_class = getattr(enemies, cname)
-            except AttributeError:
-                # NOTE here is where mods would be implemented.
-                # SEE ~/game-x/ideas.txt
-                msg = f"Unable to find class: {cname}"
-                cprint(msg, "red")
-                return
+            pass
+    # NOTE here is where mods would be implemented.
+    # SEE ~/game-x/ideas.txt
+    return None
+
+
+def create_objects(engine: Engine, **kwargs):
+    """Takes in a set of keywords and uses them to make an object.
+    Returns the object or None if it could not be made."""
+    # Classify the name
+    obj_class = get_object_class(kwargs["name"])
+    if obj_class is None:
+        cname = class_name(kwargs["name"])
+        cprint(f"Unable to find class: {cname}", "red")
+        return
 
     # Instantiate the class
     sc_entity = issubclass(obj_class, entities.Entity)
@@ -70,6 +77,7 @@ def create_objects(engine: Engine, **kwargs):
             del kwargs["pos"]
             obj = obj_class(engine, **kwargs)
         engine.objects.ent.add(obj, kwargs["key"])
+        return obj
 
 
 # Special
@@ -107,14 +115,15 @@ class Game(Application):
 
         # Objects
         self.cam = View(self, SIZE)
+        self.objects.level.object_class = get_object_class
 
         # Debug menu expansiosn
         if self.debug:
             volume = MenuText(self, self.debug.menu, "volume")
-            volume.pos = vec2d(0, 12 * 3)
+            volume.pos = vec2d(0, 12 * 4)
             volume.depth = 16
             rect = self.debug.menu.get("rect")
-            rect.size = vec2d(190, 52)
+            rect.size = vec2d(190, 64)
 
         # Load main menu
         self.objects.level.load("mainmenu")
@@ -0,0 +1,132 @@
+"""Game-X array2d growth and minimize benchmark."""
+printer = ["\033[36m# Game-X benchmark_array.py"]
+
+import sys
+from os import getcwd
+from time import perf_counter
+
+# Add main_path if not in sys.path
+root = getcwd()
+if root not in sys.path:
+    printer.append(f"adding path: {root}")
+    sys.path.insert(0, root)
+
+from main.code.engine.types import array2d
+
+
+# Reference implementation (array2d before capacity growth)
+class array2d_reference:
+    def __init__(self, size: tuple[int, int]):
+        self._array = [[None] * size[1] for _ in range(size[0])]
+        self._size = size
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self._size
+
+    @size.setter
+    def size(self, size: tuple[int, int]):
+        new = array2d_reference(size)
+        for x in range(min(self.size[0], size[0])):
+            for y in range(min(self.size[1], size[1])):
+                new.set(x, y, self.get(x, y))
+        self._array = new._array
+        self._size = size
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    def minimize(self):
+        width, height = self.size
+        for x in range(1, self.size[0]):
+            column = self.get_column(width - x)
+            if not all(cell is None for cell in column):
+                width = self.width - x + 1
+                break
+        for y in range(1, self.size[1]):
+            row = self.get_row(height - y)
+            if not all(cell is None for cell in row):
+                height = self.height - y + 1
+                break
+        self.size = (width, height)
+
+    def get(self, x: int, y: int):
+        return self._array[x][y]
+
+    def set(self, x: int, y: int, value):
+        if not (x < self.size[0] and y < self.size[1]):
+            self.size = (max(x + 1, self.size[0]), max(y + 1, self.size[1]))
+        self._array[x][y] = value
+
+    def get_column(self, x: int):
+        return self._array[x]
+
+    def get_row(self, y: int):
+        return [column[y] for column in self._array]
+
+
+# Benchmarks
+def paint_right(cls, size: int) -> float:
+    """Paint a diagonal band rightward then downward from a 16x16 grid."""
+    grid = cls((16, 16))
+    start = perf_counter()
+    for i in range(size):
+        grid.set(i, i, 1)
+        grid.set(i, size - 1 - i, 1)
+    return perf_counter() - start
+
+
+def minimize(cls, size: int) -> float:
+    """Minimize a grid whose content only fills the top left quarter."""
+    grid = cls((16, 16))
+    grid.set(size - 1, size - 1, 1)
+    for i in range(size // 2):
+        grid.set(i, i, 1)
+    grid.set(size - 1, size - 1, None)
+    start = perf_counter()
+    grid.minimize()
+    return perf_counter() - start
+
+
+def row(name: str, size: int, old, new):
+    old_text = "-" if old is None else f"{old * 1000:.1f}ms"
+    ratio = "-" if old is None else f"{old / new:.1f}x"
+    new_text = f"{new * 1000:.1f}ms"
+    print(f"{name:<10}{size:>6}{old_text:>14}{new_text:>14}{ratio:>10}")
+
+
+def main(reference_limit: int = 200):
+    for line in printer:
+        print(line)
+    print("\033[0m")
+
+    header = "".join(
+        (
+            f"{'case':<10}",
+            f"{'size':>6}",
+            f"{'reference':>14}",
+            f"{'array2d':>14}",
+            f"{'speedup':>10}",
+        )
+    )
+    print(header)
+    print("-" * len(header))
+    for size in (100, 200, 400, 1000):
+        old = None
+        if size <= reference_limit:
+            old = paint_right(array2d_reference, size)
+        row("paint", size, old, paint_right(array2d, size))
+    for size in (100, 200, 400, 1000):
+        old = None
+        if size <= reference_limit:
+            old = minimize(array2d_reference, size)
+        row("minimize", size, old, minimize(array2d, size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Game-X grid cell lookup benchmark."""
+printer = ["\033[36m# Game-X benchmark_cells.py"]
+
+import sys
+from os import getcwd
+from random import random, seed
+from timeit import repeat
+
+# Add main_path if not in sys.path
+root = getcwd()
+if root not in sys.path:
+    printer.append(f"adding path: {root}")
+    sys.path.insert(0, root)
+
+from main.code.engine.components.maths import f_cell
+from main.code.engine.types import bool_array2d, vec2d
+
+TILE = 32
+
+
+# Reference implementations (StaticCollider.get before and after f_cell)
+def get_ftup(array: bool_array2d, pos: vec2d) -> bool:
+    x, y = (pos // TILE).ftup()
+    try:
+        return bool(array.get(x, y))
+    except IndexError:
+        return False
+
+
+def get_f_cell(array: bool_array2d, pos: vec2d) -> bool:
+    x, y = f_cell(pos, TILE)
+    try:
+        return bool(array.get(x, y))
+    except IndexError:
+        return False
+
+
+# Benchmarks
+def per_call(function, positions: list, number: int = 20) -> float:
+    """Best time of a call in microseconds."""
+    best = min(
+        repeat(
+            lambda: [function(pos) for pos in positions],
+            number=number,
+            repeat=5,
+        )
+    )
+    return best / number / len(positions) * 1e6
+
+
+def main(count: int = 10000):
+    for line in printer:
+        print(line)
+    print("\033[0m")
+
+    seed(0)
+    array = bool_array2d((64, 64))
+    for x in range(64):
+        array.set(x, 40, True)
+    positions = [
+        vec2d(random() * 64 * TILE, random() * 64 * TILE)
+        for _ in range(count)
+    ]
+
+    cases = (
+        ("(pos // tile).ftup()", lambda pos: (pos // TILE).ftup()),
+        ("f_cell", lambda pos: f_cell(pos, TILE)),
+        ("get with ftup", lambda pos: get_ftup(array, pos)),
+        ("get with f_cell", lambda pos: get_f_cell(array, pos)),
+    )
+    header = f"{'lookup':<24}{'us/call':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, function in cases:
+        print(f"{name:<24}{per_call(function, positions):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
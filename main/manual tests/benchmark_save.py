@@ -0,0 +1,105 @@
+"""Game-X level save benchmark."""
+printer = ["\033[36m# Game-X benchmark_save.py"]
+
+import json
+import sys
+import uuid
+from os import getcwd, path, remove
+from tempfile import mkdtemp
+from time import perf_counter
+
+# Add main_path if not in sys.path
+root = getcwd()
+if root not in sys.path:
+    printer.append(f"adding path: {root}")
+    sys.path.insert(0, root)
+
+from main.code.engine.components import level_format
+
+
+# Reference implementation (LevelHandler.save before streaming)
+class NoIndent(object):
+    def __init__(self, value):
+        self.value = value
+
+
+class NoIndentEncoder(json.JSONEncoder):
+    def __init__(self, *args, **kwargs):
+        super(NoIndentEncoder, self).__init__(*args, **kwargs)
+        self.kwargs = dict(kwargs)
+        del self.kwargs["indent"]
+        self._replacement_map = {}
+
+    def default(self, o):
+        if isinstance(o, NoIndent):
+            key = uuid.uuid4().hex
+            self._replacement_map[key] = json.dumps(o.value, **self.kwargs)
+            return "@@%s@@" % (key,)
+        else:
+            return super(NoIndentEncoder, self).default(o)
+
+    def encode(self, o):
+        result = super(NoIndentEncoder, self).encode(o)
+        for k, v in iter(self._replacement_map.items()):
+            result = result.replace('"@@%s@@"' % (k,), v)
+        return result
+
+
+def save_reference(fname: str, entries: list[list]):
+    new_list = [NoIndent(item) for item in entries]
+    data = json.dumps(new_list, indent=4, cls=NoIndentEncoder)
+    if data.endswith("]]") or data.endswith("}]"):
+        data = data[1:-1] + "\n" + data[-1]
+    with open(fname, "w") as level:
+        level.write(data)
+
+
+# Benchmarks
+def best_of(function, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(levels: tuple[str, ...] = ("level2", "level3", "level4")):
+    for line in printer:
+        print(line)
+    print("\033[0m")
+
+    directory = mkdtemp()
+    header = "".join(
+        (
+            f"{'level':<12}",
+            f"{'bytes':>8}",
+            f"{'reference':>12}",
+            f"{'streaming':>12}",
+            f"{'speedup':>10}",
+            f"{'same':>6}",
+        )
+    )
+    print(header)
+    print("-" * len(header))
+    for name in levels:
+        source = path.join(root, "assets", "levels", name + ".json")
+        entries = level_format.to_json(level_format.read_json(source))
+        old_path = path.join(directory, name + "-reference.json")
+        new_path = path.join(directory, name + ".json")
+
+        old = best_of(lambda: save_reference(old_path, entries))
+        new = best_of(lambda: level_format.write_entries(new_path, entries))
+        with open(old_path) as old_file, open(new_path) as new_file:
+            same = old_file.read() == new_file.read()
+        size = path.getsize(new_path)
+        print(
+            f"{name:<12}{size:>8}{old * 1000:>10.1f}ms{new * 1000:>10.1f}ms"
+            f"{old / new:>9.1f}x{str(same):>6}"
+        )
+        remove(old_path)
+        remove(new_path)
+
+
+if __name__ == "__main__":
+    main()
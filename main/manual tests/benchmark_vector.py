@@ -0,0 +1,103 @@
+"""Game-X vec2d micro-benchmark."""
+printer = ["\033[36m# Game-X benchmark_vector.py"]
+
+import sys
+from math import floor
+from os import getcwd
+from timeit import repeat
+
+# Add main_path if not in sys.path
+root = getcwd()
+if root not in sys.path:
+    printer.append(f"adding path: {root}")
+    sys.path.insert(0, root)
+
+from main.code.engine.types import vec2d
+
+
+# Reference implementation (vec2d before __slots__ and fast paths)
+class vec2d_reference(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __add__(self, other):
+        other = self.parse(other)
+        return vec2d_reference(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other):
+        other = self.parse(other)
+        return vec2d_reference(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, other):
+        other = self.parse(other)
+        return vec2d_reference(self.x * other.x, self.y * other.y)
+
+    def __floordiv__(self, other):
+        other = self.parse(other)
+        return vec2d_reference(self.x // other.x, self.y // other.y)
+
+    def parse(self, other):
+        if isinstance(other, vec2d_reference):
+            return other
+        elif isinstance(other, (int, float)):
+            return vec2d_reference(other, other)
+        else:
+            raise TypeError(f"type: {type(other)} not supported by vec2d")
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+
+    def ftup(self):
+        return (floor(self.x), floor(self.y))
+
+
+# Benchmarks
+CASES = {
+    "create": "cls(1.5, 2.5)",
+    "attribute": "a.x + a.y",
+    "vec + vec": "a + b",
+    "vec - vec": "a - b",
+    "vec * scalar": "a * 32",
+    "vec // scalar": "a // 32",
+    "scollide point": "(a + b) // 32",
+    "draw offset": "(a - b).ftup()",
+}
+
+
+def bench(cls, stmt: str, number: int) -> float:
+    """Return the best time per operation in nanoseconds."""
+    namespace = {"cls": cls, "a": cls(100.5, 64.25), "b": cls(31.0, 12.0)}
+    times = repeat(stmt, globals=namespace, number=number, repeat=5)
+    return min(times) / number * 1e9
+
+
+def main(number: int = 200000):
+    for line in printer:
+        print(line)
+    print("\033[0m")
+
+    header = f"{'operation':<16}{'reference':>12}{'vec2d':>12}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, stmt in CASES.items():
+        old = bench(vec2d_reference, stmt, number)
+        new = bench(vec2d, stmt, number)
+        print(f"{name:<16}{old:>10.1f}ns{new:>10.1f}ns{old / new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Game-X entity handle check.
+
+Loads each pair of levels in turn and checks every handle taken before a
+load is stale after it, see EntityHandler.handle."""
+printer = ["\033[36m# Game-X check_handles.py"]
+
+import sys
+from os import environ, getcwd
+
+# Add main_path if not in sys.path
+root = getcwd()
+if root not in sys.path:
+    printer.append(f"adding path: {root}")
+    sys.path.insert(0, root)
+environ.setdefault("SDL_VIDEODRIVER", "dummy")
+environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from main.code.constants import FPS, FULLTILE, SIZE
+from main.code.engine.constants import cprint
+from main.main_application import Game
+
+
+def check(game: Game, first: str, second: str) -> list[str]:
+    """Handles to the objects of first which resolve after loading
+    second or reloading first."""
+    game.objects.level.load(first)
+    ent = game.objects.ent
+    handles = [(ent.handle(key), obj) for key, obj in ent.obj.items()]
+
+    failed = []
+    for level_name in (second, first):
+        game.objects.level.load(level_name)
+        for handle, obj in handles:
+            found = game.objects.ent.resolve(handle)
+            if found is not None:
+                failed.append(
+                    f"{first} -> {level_name}: {handle} of "
+                    f"{type(obj).__name__} resolves to "
+                    f"{type(found).__name__}"
+                )
+
+    # Resets free every key too
+    game.objects.level.load(first)
+    ent = game.objects.ent
+    handles = [ent.handle(key) for key in ent.obj]
+    game.objects.level.reset()
+    failed += [
+        f"{first} reset: {handle} resolves"
+        for handle in handles
+        if game.objects.ent.resolve(handle) is not None
+    ]
+    return failed
+
+
+def main(levels: tuple[str, ...] = ("level1", "level2", "level3")):
+    for line in printer:
+        print(line)
+    print("\033[0m")
+
+    game = Game(FULLTILE, FPS, SIZE, root)
+    failed = []
+    for first, second in zip(levels, levels[1:] + levels[:1]):
+        failed += check(game, first, second)
+    for line in failed:
+        cprint(line, "red")
+    if failed:
+        return 1
+    cprint("no stale handles resolve", "green")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())